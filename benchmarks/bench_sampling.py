@@ -0,0 +1,44 @@
+from skconfig.sampler import Sampler
+from skconfig.sampler import clear_space_cache
+
+from .common import make_sampler
+from .common import make_space
+
+
+class SamplerConstruction:
+    params = (["logistic", "synthetic_50", "synthetic_500"], [False, True])
+    param_names = ["space", "cached"]
+    timeout = 300
+
+    def setup(self, space, cached):
+        self.validator, self.dists = make_space(space)
+        clear_space_cache()
+        if cached:
+            Sampler(self.validator, **self.dists)
+
+    def time_construct(self, space, cached):
+        if not cached:
+            clear_space_cache()
+        Sampler(self.validator, **self.dists)
+
+
+class Sample:
+    params = (["logistic", "synthetic_50"], ["configspace", "numpy"],
+              [1, 100, 10000])
+    param_names = ["space", "engine", "size"]
+    timeout = 300
+
+    def setup(self, space, engine, size):
+        self.sampler = make_sampler(space, engine=engine)
+
+    def time_sample(self, space, engine, size):
+        self.sampler.sample(size)
+
+    def time_sample_batch(self, space, engine, size):
+        self.sampler.sample(size, as_batch=True)
+
+    def peakmem_sample(self, space, engine, size):
+        self.sampler.sample(size)
+
+    def peakmem_sample_batch(self, space, engine, size):
+        self.sampler.sample(size, as_batch=True)
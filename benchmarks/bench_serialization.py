@@ -0,0 +1,56 @@
+import io
+
+from skconfig.sampler import Sampler
+from skconfig.serialization import iter_jsonl
+from skconfig.serialization import load_samples
+from skconfig.serialization import save_samples
+from skconfig.serialization import write_jsonl
+
+from .common import make_sampler
+
+
+class SpecRoundTrip:
+    params = ["logistic", "synthetic_500"]
+    param_names = ["space"]
+
+    def setup(self, space):
+        self.sampler = make_sampler(space)
+        self.spec = self.sampler.to_dict()
+
+    def time_to_dict(self, space):
+        self.sampler.to_dict()
+
+    def time_from_dict(self, space):
+        Sampler(self.sampler.validator).from_dict(self.spec)
+
+
+class SampleSerialization:
+    params = [1000, 100000]
+    param_names = ["size"]
+    timeout = 300
+
+    def setup(self, size):
+        sampler = make_sampler("logistic", engine="numpy")
+        self.batch = sampler.sample(size, as_batch=True)
+        self.jsonl = io.StringIO()
+        write_jsonl(self.batch, self.jsonl)
+        self.npz = io.BytesIO()
+        save_samples(self.npz, self.batch)
+
+    def time_write_jsonl(self, size):
+        write_jsonl(self.batch, io.StringIO())
+
+    def time_read_jsonl(self, size):
+        self.jsonl.seek(0)
+        for _ in iter_jsonl(self.jsonl):
+            pass
+
+    def time_save_npz(self, size):
+        save_samples(io.BytesIO(), self.batch)
+
+    def time_load_npz(self, size):
+        self.npz.seek(0)
+        load_samples(self.npz)
+
+    def peakmem_save_npz(self, size):
+        save_samples(io.BytesIO(), self.batch)
@@ -0,0 +1,36 @@
+from .common import make_sampler
+from .common import make_space
+
+
+class ValidateParams:
+    params = ["logistic", "synthetic_50", "synthetic_500"]
+    param_names = ["space"]
+
+    def setup(self, space):
+        self.validator, _ = make_space(space)
+        self.configs = make_sampler(space, engine="numpy").sample(200)
+        self.estimator = self.validator.estimator(**self.configs[0])
+
+    def time_validate_params(self, space):
+        validate_params = self.validator.validate_params
+        for config in self.configs:
+            validate_params(**config)
+
+    def time_check_params(self, space):
+        check_params = self.validator.check_params
+        for config in self.configs:
+            check_params(config, collect_all=True)
+
+    def time_validate_estimator(self, space):
+        self.validator.validate_estimator(self.estimator)
+
+    def time_validate_many(self, space):
+        self.validator.validate_many(self.configs)
+
+
+class ValidatorCreation:
+    params = ["logistic", "synthetic_500"]
+    param_names = ["space"]
+
+    def time_create_validator(self, space):
+        make_space(space)
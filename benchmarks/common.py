@@ -0,0 +1,171 @@
+"""Validators and samplers shared by the benchmarks.
+
+The estimators only implement ``get_params`` so the benchmarks do not
+depend on the installed scikit-learn version.
+"""
+from skconfig.condition import EqualsCondition
+from skconfig.distribution import CategoricalDistribution
+from skconfig.distribution import ConstantDistribution
+from skconfig.distribution import UniformBoolDistribution
+from skconfig.distribution import UniformFloatDistribution
+from skconfig.distribution import UniformIntDistribution
+from skconfig.distribution import UnionDistribution
+from skconfig.forbidden import ForbiddenAnd
+from skconfig.forbidden import ForbiddenEquals
+from skconfig.forbidden import ForbiddenIn
+from skconfig.parameter import BoolParam
+from skconfig.parameter import FloatIntervalParam
+from skconfig.parameter import IntIntervalParam
+from skconfig.parameter import IntParam
+from skconfig.parameter import NoneParam
+from skconfig.parameter import StringParam
+from skconfig.parameter import UnionParam
+from skconfig.sampler import Sampler
+from skconfig.validator import BaseValidator
+
+CHOICES = ["a", "b", "c", "d"]
+
+
+class Estimator:
+    defaults = {}
+
+    def __init__(self, **params):
+        self.params = dict(self.defaults)
+        self.params.update(params)
+
+    def get_params(self, deep=True):
+        return dict(self.params)
+
+
+class LogisticRegression(Estimator):
+    defaults = {
+        "penalty": "l2",
+        "dual": False,
+        "tol": 1e-4,
+        "C": 1.0,
+        "fit_intercept": True,
+        "intercept_scaling": 1,
+        "class_weight": None,
+        "random_state": None,
+        "solver": "lbfgs",
+        "max_iter": 100,
+        "multi_class": "ovr",
+        "verbose": 0,
+        "warm_start": False,
+        "n_jobs": None,
+    }
+
+
+class LogRegressionValidator(BaseValidator):
+    estimator = LogisticRegression
+
+    penalty = StringParam("l2", "l1")
+    dual = BoolParam()
+    tol = FloatIntervalParam(lower=0, include_lower=False)
+    C = FloatIntervalParam(lower=0)
+    fit_intercept = BoolParam()
+    intercept_scaling = FloatIntervalParam(lower=0, include_lower=False)
+    class_weight = NoneParam()
+    random_state = UnionParam(IntParam(), NoneParam())
+    solver = StringParam("newton-cg", "lbfgs", "liblinear", "sag", "saga")
+    max_iter = IntIntervalParam(lower=1)
+    multi_class = StringParam("ovr", "multinomial", "auto")
+    verbose = IntParam()
+    warm_start = BoolParam()
+    n_jobs = UnionParam(NoneParam(), IntIntervalParam(lower=-1))
+
+    forbiddens = [
+        ForbiddenAnd([
+            ForbiddenEquals("penalty", "l1"),
+            ForbiddenIn("solver", ["newton-cg", "sag", "lbfgs"])
+        ]),
+        ForbiddenAnd([
+            ForbiddenEquals("solver", "liblinear"),
+            ForbiddenEquals("multi_class", "multinomial")
+        ]),
+    ]
+
+
+def log_regression_distributions():
+    return {
+        "dual": UniformBoolDistribution(),
+        "C": UniformFloatDistribution(0.001, 10.0, log=True),
+        "solver": CategoricalDistribution(
+            ["newton-cg", "lbfgs", "liblinear", "sag", "saga"]),
+        "random_state": UnionDistribution(
+            ConstantDistribution(None), UniformIntDistribution(0, 10)),
+        "penalty": CategoricalDistribution(["l2", "l1"]),
+        "multi_class": CategoricalDistribution(["ovr", "multinomial"]),
+    }
+
+
+def make_synthetic(n_groups):
+    """Validator class and distributions with ``5 * n_groups`` Params.
+
+    Every group has a string, an int, a float, a union and a bool Param.
+    The int is conditioned on the string, and every fifth string has
+    forbidden values given the previous string.
+    """
+    defaults = {}
+    attrs = {"conditions": [], "forbiddens": []}
+    dists = {}
+    for i in range(n_groups):
+        choice, integer, real, union, flag = (
+            "choice_{}".format(i), "int_{}".format(i), "float_{}".format(i),
+            "union_{}".format(i), "bool_{}".format(i))
+        attrs[choice] = StringParam(*CHOICES)
+        attrs[integer] = IntIntervalParam(lower=0, upper=100)
+        attrs[real] = FloatIntervalParam(lower=0, upper=1)
+        attrs[union] = UnionParam(IntIntervalParam(lower=0), NoneParam())
+        attrs[flag] = BoolParam()
+        defaults.update({
+            choice: "a",
+            integer: None,
+            real: 0.5,
+            union: None,
+            flag: True
+        })
+        dists.update({
+            choice: CategoricalDistribution(CHOICES),
+            integer: UniformIntDistribution(0, 100),
+            real: UniformFloatDistribution(0.0, 1.0),
+            union: UnionDistribution(
+                ConstantDistribution(None), UniformIntDistribution(0, 10)),
+            flag: UniformBoolDistribution(),
+        })
+        attrs["conditions"].append(EqualsCondition(integer, choice, "b"))
+        if i % 5 == 0 and i:
+            attrs["forbiddens"].append(
+                ForbiddenAnd([
+                    ForbiddenEquals("choice_{}".format(i - 1), "c"),
+                    ForbiddenIn(choice, ["c", "d"])
+                ]))
+
+    estimator = type("SyntheticEstimator{}".format(n_groups), (Estimator, ),
+                     {"defaults": defaults})
+    attrs["estimator"] = estimator
+    validator_cls = type("SyntheticValidator{}".format(n_groups),
+                         (BaseValidator, ), attrs)
+    return validator_cls, dists
+
+
+SPACES = {
+    "logistic": (LogRegressionValidator, log_regression_distributions),
+    "synthetic_50": lambda: make_synthetic(10),
+    "synthetic_500": lambda: make_synthetic(100),
+}
+
+
+def make_space(name):
+    """Return a validator instance and its distributions."""
+    space = SPACES[name]
+    if isinstance(space, tuple):
+        validator_cls, dists = space[0], space[1]()
+    else:
+        validator_cls, dists = space()
+    return validator_cls(), dists
+
+
+def make_sampler(name, engine="configspace", seed=0):
+    validator, dists = make_space(name)
+    return Sampler(validator, engine=engine, seed=seed, **dists)
@@ -27,10 +27,10 @@ setup(
     author='Thomas J Fan',
     author_email='thomasjpfan@gmail.com',
     url='https://github.com/thomasjpfan/skconfig',
-    packages=find_packages(include=['skconfig']),
+    packages=find_packages(include=['skconfig', 'skconfig.*']),
     install_requires=install_requires,
     include_package_data=True,
-    python_requires='>=3.5',
+    python_requires='>=3.8',
     zip_safe=False,
     license='MIT',
     classifiers=[
@@ -42,9 +42,9 @@ setup(
         'Natural Language :: English',
         "License :: OSI Approved :: MIT License",
         'Programming Language :: Python :: 3 :: Only',
-        'Programming Language :: Python :: 3.5',
-        'Programming Language :: Python :: 3.6',
+        'Programming Language :: Python :: 3.8',
     ],
     extras_require={
         'dev': dev_requires,
+        'qmc': ['scipy>=1.7'],
     })
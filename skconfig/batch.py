@@ -0,0 +1,303 @@
+from collections.abc import Mapping
+from itertools import repeat
+from operator import contains, is_, methodcaller
+
+import numpy as np
+
+from .exceptions import SKConfigValueError
+
+# Python type of the elements of a typed numpy array, e.g. an element of an
+# int64 array behaves like an int once converted with ``tolist``
+_KIND_TO_TYPE = {'b': bool, 'i': int, 'u': int, 'f': float, 'U': str}
+
+
+def _object_array(values):
+    # Sequences must be stored as elements instead of being broadcasted into
+    # extra dimensions, which np.array would do
+    try:
+        return np.fromiter(values, dtype=object, count=len(values))
+    except (TypeError, ValueError):
+        # numpy < 1.23 does not support object dtype in fromiter
+        array = np.empty(len(values), dtype=object)
+        for i, value in enumerate(values):
+            array[i] = value
+        return array
+
+
+def _as_column_array(values):
+    if isinstance(values, np.ndarray):
+        if values.ndim != 1:
+            raise SKConfigValueError("columns must be one dimensional")
+        return values
+    return _object_array(list(values))
+
+
+def _to_python(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _compare(op, value, other):
+    try:
+        return bool(op(value, other))
+    except TypeError:
+        return False
+
+
+class Column:
+    """Values of one parameter across a batch of configurations.
+
+    Rows flagged in ``missing`` do not have the parameter at all and hold
+    ``None``, which matches what ``dict.get`` returns in scalar validation.
+    """
+
+    def __init__(self, values, missing=None):
+        self.values = values
+        self.missing = missing
+        self._type_codes = None
+        self._types = None
+
+    def __len__(self):
+        return len(self.values)
+
+    def full(self, fill_value):
+        return np.full(len(self), fill_value, dtype=bool)
+
+    def take(self, mask):
+        missing = None if self.missing is None else self.missing[mask]
+        column = Column(self.values[mask], missing)
+        if self._type_codes is not None:
+            column._type_codes = self._type_codes[mask]
+            column._types = self._types
+        return column
+
+    @property
+    def is_none(self):
+        if self.values.dtype.kind != 'O':
+            none = self.full(False)
+        else:
+            none = np.fromiter(map(is_, self.values, repeat(None)),
+                               dtype=bool,
+                               count=len(self))
+        if self.missing is not None:
+            none |= self.missing
+        return none
+
+    def _element_types(self):
+        if self._type_codes is None:
+            element_types = list(map(type, self.values))
+            types = list(dict.fromkeys(element_types))
+            type_to_code = {t: code for code, t in enumerate(types)}
+            self._type_codes = np.fromiter(
+                map(type_to_code.__getitem__, element_types),
+                dtype=np.intp,
+                count=len(self))
+            self._types = types
+        return self._type_codes, self._types
+
+    def type_mask(self, value_type):
+        """Rows whose value is an instance of ``value_type``."""
+        kind = self.values.dtype.kind
+        if kind in _KIND_TO_TYPE:
+            return self.full(issubclass(_KIND_TO_TYPE[kind], value_type))
+
+        codes, types = self._element_types()
+        table = np.array([issubclass(t, value_type) for t in types],
+                         dtype=bool)
+        if not len(table):
+            return self.full(False)
+        return table[codes]
+
+    def equals(self, other):
+        result = self.values == other
+        if np.ndim(result) == 0:
+            # numpy could not compare elementwise, e.g. a number with an
+            # array of strings
+            return self.full(bool(result))
+        return np.asarray(result, dtype=bool)
+
+    def isin(self, others):
+        mask = self.full(False)
+        for other in others:
+            mask |= self.equals(other)
+        return mask
+
+    def compare(self, op, other):
+        """Apply ``op(value, other)`` elementwise, e.g. ``operator.lt``.
+
+        Rows that can not be compared with ``other``, e.g. a string with a
+        number, are False. Their Param rejects them anyway.
+        """
+        if not len(self):
+            return self.full(False)
+        try:
+            result = op(self.values, other)
+        except TypeError:
+            result = None
+        if result is not None and np.ndim(result) != 0:
+            return np.asarray(result, dtype=bool)
+        return np.fromiter(
+            (_compare(op, _to_python(value), other) for value in self.values),
+            dtype=bool,
+            count=len(self))
+
+    def map_valid(self, check):
+        """Rows for which ``check(value)`` returns ``None``."""
+        return np.fromiter(
+            (check(_to_python(value)) is None for value in self.values),
+            dtype=bool,
+            count=len(self))
+
+
+class ColumnSet:
+    """Batch of configurations stored as one ``Column`` per parameter.
+
+    Columns for parameters that were not given are filled from
+    ``defaults``, like the merge done in ``validate_params``.
+    """
+
+    def __init__(self, columns, given, n_rows, records=None):
+        self.columns = columns
+        self.given = given
+        self.n_rows = n_rows
+        self.records = records
+
+    @classmethod
+    def from_data(cls, data, defaults):
+        """Build from records, a dict of columns or a DataFrame."""
+        if isinstance(data, Mapping):
+            return cls.from_columns(data, defaults)
+        if hasattr(data, 'columns') and hasattr(data, 'iloc'):
+            return cls.from_columns(
+                {name: data[name].to_numpy()
+                 for name in data.columns}, defaults)
+        return cls.from_records(data, defaults)
+
+    @classmethod
+    def from_columns(cls, data, defaults):
+        arrays = {name: _as_column_array(values)
+                  for name, values in data.items()}
+        lengths = {len(array) for array in arrays.values()}
+        if len(lengths) > 1:
+            raise SKConfigValueError("columns must have the same length")
+        n_rows = lengths.pop() if lengths else 0
+
+        columns = {}
+        for name, value in defaults.items():
+            if name not in arrays:
+                columns[name] = Column(_object_array([value] * n_rows))
+        for name, array in arrays.items():
+            columns[name] = Column(array)
+        given = {name: None for name in arrays}
+        return cls(columns, given, n_rows)
+
+    @classmethod
+    def from_records(cls, records, defaults):
+        records = list(records)
+        n_rows = len(records)
+
+        names = dict.fromkeys(defaults)
+        for record in records:
+            names.update(record)
+
+        columns = {}
+        given = {}
+        for name in names:
+            has_name = np.fromiter(map(contains, records, repeat(name)),
+                                   dtype=bool,
+                                   count=n_rows)
+            if name in defaults:
+                default = defaults[name]
+                missing = None
+            else:
+                default = None
+                missing = ~has_name
+            values = _object_array(
+                list(map(methodcaller('get', name, default), records)))
+            columns[name] = Column(values, missing)
+            if has_name.any():
+                given[name] = has_name
+        return cls(columns, given, n_rows, records=records)
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def __getitem__(self, name):
+        try:
+            return self.columns[name]
+        except KeyError:
+            return Column(_object_array([None] * self.n_rows),
+                          missing=self.full(True))
+
+    def full(self, fill_value):
+        return np.full(self.n_rows, fill_value, dtype=bool)
+
+    def given_mask(self, name):
+        """Rows where ``name`` was given explicitly."""
+        mask = self.given[name]
+        if mask is None:
+            return self.full(True)
+        return mask
+
+    def row(self, index):
+        """Parameters given explicitly for row ``index``."""
+        if self.records is not None:
+            return self.records[index]
+        return {
+            name: _to_python(self.columns[name].values[index])
+            for name in self.given
+        }
+
+    def rows(self):
+        """Merged parameters of every row, as dicts."""
+        for index in range(self.n_rows):
+            row = {}
+            for name, column in self.columns.items():
+                if column.missing is None or not column.missing[index]:
+                    row[name] = _to_python(column.values[index])
+            yield row
+
+    def map_rows(self, func):
+        return np.fromiter((bool(func(row)) for row in self.rows()),
+                           dtype=bool,
+                           count=self.n_rows)
+
+
+class BatchResult:
+    """Outcome of ``BaseValidator.validate_many``.
+
+    ``mask`` flags the valid rows. ``errors`` maps the index of every
+    invalid row to the first ``Violation`` found by ``check_params``, and
+    is only computed when first accessed.
+    """
+
+    def __init__(self, mask, columns, validator):
+        self.mask = mask
+        self._columns = columns
+        self._validator = validator
+        self._errors = None
+
+    def __len__(self):
+        return len(self.mask)
+
+    @property
+    def n_valid(self):
+        return int(np.count_nonzero(self.mask))
+
+    @property
+    def invalid_indices(self):
+        return np.flatnonzero(~self.mask)
+
+    @property
+    def errors(self):
+        if self._errors is None:
+            errors = {}
+            for index in self.invalid_indices:
+                index = int(index)
+                result = self._validator.check_params(
+                    self._columns.row(index))
+                if result.errors:
+                    errors[index] = result.errors[0]
+            self._errors = errors
+        return self._errors
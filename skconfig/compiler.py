@@ -0,0 +1,314 @@
+from collections.abc import Hashable
+from itertools import product
+
+from .condition import AndCondition
+from .condition import EqualsCondition
+from .condition import GreaterThanCondition
+from .condition import InCondition
+from .condition import LessThanCondition
+from .condition import NotEqualsCondition
+from .condition import OrCondition
+from .forbidden import ForbiddenAnd
+from .forbidden import ForbiddenEquals
+from .forbidden import ForbiddenIn
+
+
+def _unique(values):
+    output = []
+    for value in values:
+        if value is not None and value not in output:
+            output.append(value)
+    return tuple(output)
+
+
+def lower_forbidden(forbidden):
+    """Lower a forbidden clause into a conjunction of atoms.
+
+    Returns a tuple of ``(name, values)`` pairs: ``forbidden`` matches when
+    the value of every ``name`` is in its ``values``. Nested
+    ``ForbiddenAnd`` are flattened and atoms on the same name are
+    intersected. Returns None for clause types it does not know, including
+    subclasses of the builtin clauses which may change their semantics.
+    """
+    clause_type = type(forbidden)
+    if clause_type is ForbiddenAnd:
+        atoms = {}
+        for clause in forbidden.forbidden_clauses:
+            clause_atoms = lower_forbidden(clause)
+            if clause_atoms is None:
+                return None
+            for name, values in clause_atoms:
+                if name in atoms:
+                    values = tuple(v for v in atoms[name] if v in values)
+                atoms[name] = values
+        return tuple(atoms.items())
+    if clause_type is ForbiddenIn:
+        return ((forbidden.name, _unique(forbidden.value)), )
+    if clause_type is ForbiddenEquals:
+        return ((forbidden.name, _unique([forbidden.value])), )
+    return None
+
+
+def forbidden_from_atoms(atoms):
+    """Inverse of ``lower_forbidden``."""
+    clauses = []
+    for name, values in atoms:
+        if len(values) == 1:
+            clauses.append(ForbiddenEquals(name, values[0]))
+        else:
+            clauses.append(ForbiddenIn(name, list(values)))
+    if len(clauses) == 1:
+        return clauses[0]
+    return ForbiddenAnd(clauses)
+
+
+def _is_hashable(values):
+    return all(isinstance(value, Hashable) for value in values)
+
+
+class CompiledForbiddens:
+    """Forbidden clauses lowered to hashed lookup tables.
+
+    Clauses over the same set of names share one table mapping a tuple of
+    forbidden values to the indices of the clauses forbidding it, so a
+    single dict lookup evaluates all of them. Clauses whose table would be
+    larger than ``max_table_size`` use per atom membership tests, and
+    clauses that can not be lowered are evaluated directly.
+    """
+
+    def __init__(self, forbiddens, max_table_size=4096):
+        self.forbiddens = tuple(forbiddens)
+        tables = {}
+        atom_sets = {}
+        self._atom_clauses = []
+        self._direct_clauses = []
+
+        for index, forbidden in enumerate(self.forbiddens):
+            atoms = lower_forbidden(forbidden)
+            if atoms is None or not all(
+                    _is_hashable(values) for _, values in atoms):
+                self._direct_clauses.append((index, forbidden))
+                continue
+            if not all(values for _, values in atoms):
+                # An empty atom can never match
+                continue
+
+            atoms = sorted(atoms, key=lambda atom: atom[0])
+            size = 1
+            for _, values in atoms:
+                size *= len(values)
+            if size > max_table_size:
+                shared_atoms = []
+                for name, values in atoms:
+                    key = (name, frozenset(values))
+                    shared_atoms.append(atom_sets.setdefault(key, key))
+                self._atom_clauses.append((index, tuple(shared_atoms)))
+                continue
+
+            names = tuple(name for name, _ in atoms)
+            table, indices = tables.setdefault(names, ({}, []))
+            indices.append(index)
+            for key in product(*(values for _, values in atoms)):
+                table[key] = table.get(key, ()) + (index, )
+
+        self._tables = tuple(
+            (names, table, tuple(indices))
+            for names, (table, indices) in tables.items())
+
+    def _matching_indices(self, params):
+        get = params.get
+        matching = []
+        for names, table, indices in self._tables:
+            key = tuple(get(name) for name in names)
+            try:
+                matching.extend(table.get(key, ()))
+            except TypeError:
+                # Unhashable parameter value, check the clauses one by one
+                matching.extend(index for index in indices
+                                if self.forbiddens[index].matches(params))
+
+        for index, atoms in self._atom_clauses:
+            try:
+                for name, values in atoms:
+                    value = get(name)
+                    if value is None or value not in values:
+                        break
+                else:
+                    matching.append(index)
+            except TypeError:
+                if self.forbiddens[index].matches(params):
+                    matching.append(index)
+
+        for index, forbidden in self._direct_clauses:
+            if forbidden.matches(params):
+                matching.append(index)
+        return matching
+
+    def matches(self, params):
+        return bool(self._matching_indices(params))
+
+    def violations(self, params):
+        """Violations of every matching clause, in declaration order."""
+        return [
+            self.forbiddens[index].violation(params)
+            for index in sorted(self._matching_indices(params))
+        ]
+
+    def violation(self, params):
+        """Violation of the first matching clause, or None."""
+        indices = self._matching_indices(params)
+        if not indices:
+            return None
+        return self.forbiddens[min(indices)].violation(params)
+
+    def forbidden_mask(self, columns):
+        mask = columns.full(False)
+        for forbidden in self.forbiddens:
+            mask |= forbidden.forbidden_mask(columns)
+        return mask
+
+
+def _equals_values(condition):
+    # Parent and accepted values when the condition is an equality test
+    if type(condition) is EqualsCondition:
+        return condition.parent, (condition.conditioned_value, )
+    if type(condition) is OrCondition:
+        parents, values = set(), []
+        for cond in condition.conditions:
+            inner = _equals_values(cond)
+            if inner is None:
+                return None
+            parents.add(inner[0])
+            values.extend(inner[1])
+        if len(parents) == 1:
+            return parents.pop(), tuple(values)
+    return None
+
+
+def compile_condition(condition, shared=None):
+    """Compile a condition into a predicate taking a dict of parameters.
+
+    Or conditions over equality tests on one parent become a single set
+    membership test. ``shared`` maps a structural key to an already
+    compiled predicate, so identical sub-conditions of different conditions
+    share the same predicate.
+    """
+    if shared is None:
+        shared = {}
+
+    equals = _equals_values(condition)
+    if equals is not None and len(equals[1]) > 1 and _is_hashable(
+            equals[1]):
+        parent, values = equals[0], frozenset(equals[1])
+        key = ('in_not_none', parent, values)
+        if key not in shared:
+            shared[key] = _in_not_none(parent, values, equals[1])
+        return shared[key]
+
+    cond_type = type(condition)
+    if cond_type in (AndCondition, OrCondition):
+        predicates = tuple(
+            compile_condition(cond, shared) for cond in condition.conditions)
+        if cond_type is AndCondition:
+
+            def active(params):
+                for predicate in predicates:
+                    if not predicate(params):
+                        return False
+                return True
+        else:
+
+            def active(params):
+                for predicate in predicates:
+                    if predicate(params):
+                        return True
+                return False
+
+        return active
+
+    if cond_type not in _ATOMS:
+        return condition.evaluate
+
+    parent = condition.parent
+    conditioned_value = condition.conditioned_value
+    if cond_type is InCondition and _is_hashable(conditioned_value):
+        key = (cond_type, parent, frozenset(conditioned_value))
+    else:
+        key = (cond_type, parent, conditioned_value)
+    try:
+        hash(key)
+    except TypeError:
+        return _ATOMS[cond_type](parent, conditioned_value)
+    if key not in shared:
+        shared[key] = _ATOMS[cond_type](parent, conditioned_value)
+    return shared[key]
+
+
+def _equals(parent, conditioned_value):
+    def active(params):
+        value = params.get(parent)
+        return value is not None and value == conditioned_value
+
+    return active
+
+
+def _not_equals(parent, conditioned_value):
+    def active(params):
+        value = params.get(parent)
+        return value is not None and value != conditioned_value
+
+    return active
+
+
+def _less_than(parent, conditioned_value):
+    def active(params):
+        value = params.get(parent)
+        return value is None or value < conditioned_value
+
+    return active
+
+
+def _greater_than(parent, conditioned_value):
+    def active(params):
+        value = params.get(parent)
+        return value is None or value > conditioned_value
+
+    return active
+
+
+def _in(parent, conditioned_value):
+    values = (frozenset(conditioned_value)
+              if _is_hashable(conditioned_value) else conditioned_value)
+
+    def active(params):
+        value = params.get(parent)
+        if value is None:
+            return True
+        try:
+            return value in values
+        except TypeError:
+            return value in conditioned_value
+
+    return active
+
+
+def _in_not_none(parent, values, sequence):
+    def active(params):
+        value = params.get(parent)
+        if value is None:
+            return False
+        try:
+            return value in values
+        except TypeError:
+            return value in sequence
+
+    return active
+
+
+_ATOMS = {
+    EqualsCondition: _equals,
+    NotEqualsCondition: _not_equals,
+    LessThanCondition: _less_than,
+    GreaterThanCondition: _greater_than,
+    InCondition: _in,
+}
@@ -0,0 +1,82 @@
+from types import MappingProxyType
+from weakref import WeakKeyDictionary
+
+from .defaults import get_default_params
+from .exceptions import SKConfigValueError
+from .validator import BaseValidator
+
+_EMPTY_PARAMS = MappingProxyType({})
+_composite_defaults = WeakKeyDictionary()
+
+
+def _is_validated(name, checkers):
+    if name in checkers:
+        return True
+    parts = name.split('__')
+    if len(parts) == 1:
+        # Top level parameters without a Param, e.g. steps or memory
+        return False
+    # Parameters of an object that is validated as a whole are skipped,
+    # other step__name keys are checked and unknown ones are reported
+    return not any('__'.join(parts[:i]) in checkers
+                   for i in range(1, len(parts)))
+
+
+class CompositeValidator(BaseValidator):
+    """Validates a Pipeline or a meta-estimator in a single pass.
+
+    ``validators`` maps step names to validator classes. Their Params,
+    forbiddens and conditions are compiled into the plan of the composite
+    under the ``step__name`` keys of ``get_params(deep=True)``, and can be
+    combined with composites for nested steps. Params, forbiddens and
+    conditions declared on the composite apply to the top level
+    parameters, ``estimator`` is optional.
+
+    ``validate_estimator`` skips top level parameters without a Param, such
+    as ``steps`` or the step estimators.
+    """
+    validators = {}
+
+    def _check_definition(self):
+        # estimator is optional
+        if not self.validators:
+            raise SKConfigValueError("validators must be defined")
+
+    @classmethod
+    def default_params(cls):
+        """Defaults of the step validators under prefixed names, and of
+        ``estimator`` when it is set. Built once per class."""
+        own = (_EMPTY_PARAMS
+               if cls.estimator is None else get_default_params(cls.estimator))
+        steps = [(step, validator.default_params())
+                 for step, validator in cls.validators.items()]
+        cached = _composite_defaults.get(cls)
+        if cached is not None:
+            cached_own, cached_steps, params = cached
+            if cached_own is own and len(cached_steps) == len(steps) and all(
+                    step == cached_step and step_params is cached_params
+                    for (step, step_params), (cached_step, cached_params) in
+                    zip(steps, cached_steps)):
+                return params
+
+        params = dict(own)
+        for step, step_params in steps:
+            for name, value in step_params.items():
+                params["{}__{}".format(step, name)] = value
+        params = MappingProxyType(params)
+        _composite_defaults[cls] = (own, steps, params)
+        return params
+
+    def _estimator_params(self, estimator):
+        checkers = self._plan.checkers
+        return {
+            name: value
+            for name, value in estimator.get_params(deep=True).items()
+            if _is_validated(name, checkers)
+        }
+
+    def validate_estimator(self, estimator):
+        self._validate(self._estimator_params(estimator))
+
+    def check_estimator(self, estimator, collect_all=False):
+        return self._check(self._estimator_params(estimator), collect_all)
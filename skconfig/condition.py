@@ -1,4 +1,5 @@
 from abc import ABCMeta, abstractmethod
+from operator import gt, lt
 from .exceptions import SKConfigValueError
 
 
@@ -12,14 +13,40 @@ class Condition(metaclass=ABCMeta):
     def is_active(self, **kwargs):
         ...
 
+    @property
+    def names(self):
+        """Parameter names this condition depends on, including the child."""
+        return frozenset([self.child, self.parent])
+
+    def evaluate(self, params):
+        """Same as ``is_active`` with the parameters passed as a dict."""
+        return self.is_active(**params)
+
+    def prefixed(self, prefix):
+        """Copy of the condition with ``prefix`` added to every name."""
+        return type(self)(prefix + self.child, prefix + self.parent,
+                          self.conditioned_value)
+
+    def active_mask(self, columns):
+        """Boolean mask of the rows of a ``ColumnSet`` where the condition
+        is active."""
+        return columns.map_rows(self.evaluate)
+
 
 class EqualsCondition(Condition):
     def is_active(self, **kwargs):
-        value = kwargs.get(self.parent)
+        return self.evaluate(kwargs)
+
+    def evaluate(self, params):
+        value = params.get(self.parent)
         if value is None:
             return False
         return value == self.conditioned_value
 
+    def active_mask(self, columns):
+        column = columns[self.parent]
+        return ~column.is_none & column.equals(self.conditioned_value)
+
     def __repr__(self):
         return "Child: {} Condition: {} == {}".format(self.child, self.parent,
                                                       self.conditioned_value)
@@ -27,11 +54,18 @@ class EqualsCondition(Condition):
 
 class NotEqualsCondition(Condition):
     def is_active(self, **kwargs):
-        value = kwargs.get(self.parent)
+        return self.evaluate(kwargs)
+
+    def evaluate(self, params):
+        value = params.get(self.parent)
         if value is None:
             return False
         return value != self.conditioned_value
 
+    def active_mask(self, columns):
+        column = columns[self.parent]
+        return ~column.is_none & ~column.equals(self.conditioned_value)
+
     def __repr__(self):
         return "Child: {} Condition: {} != {}".format(self.child, self.parent,
                                                       self.conditioned_value)
@@ -39,11 +73,22 @@ class NotEqualsCondition(Condition):
 
 class LessThanCondition(Condition):
     def is_active(self, **kwargs):
-        value = kwargs.get(self.parent)
+        return self.evaluate(kwargs)
+
+    def evaluate(self, params):
+        value = params.get(self.parent)
         if value is None:
             return True
         return value < self.conditioned_value
 
+    def active_mask(self, columns):
+        column = columns[self.parent]
+        mask = column.is_none
+        not_none = ~mask
+        mask[not_none] = column.take(not_none).compare(
+            lt, self.conditioned_value)
+        return mask
+
     def __repr__(self):
         return "Child: {} Condition: {} < {}".format(self.child, self.parent,
                                                      self.conditioned_value)
@@ -51,11 +96,22 @@ class LessThanCondition(Condition):
 
 class GreaterThanCondition(Condition):
     def is_active(self, **kwargs):
-        value = kwargs.get(self.parent)
+        return self.evaluate(kwargs)
+
+    def evaluate(self, params):
+        value = params.get(self.parent)
         if value is None:
             return True
         return value > self.conditioned_value
 
+    def active_mask(self, columns):
+        column = columns[self.parent]
+        mask = column.is_none
+        not_none = ~mask
+        mask[not_none] = column.take(not_none).compare(
+            gt, self.conditioned_value)
+        return mask
+
     def __repr__(self):
         return "Child: {} Condition: {} > {}".format(self.child, self.parent,
                                                      self.conditioned_value)
@@ -63,11 +119,18 @@ class GreaterThanCondition(Condition):
 
 class InCondition(Condition):
     def is_active(self, **kwargs):
-        value = kwargs.get(self.parent)
+        return self.evaluate(kwargs)
+
+    def evaluate(self, params):
+        value = params.get(self.parent)
         if value is None:
             return True
         return value in self.conditioned_value
 
+    def active_mask(self, columns):
+        column = columns[self.parent]
+        return column.is_none | column.isin(self.conditioned_value)
+
     def __repr__(self):
         return "Child: {} Condition: {} in {}".format(self.child, self.parent,
                                                       self.conditioned_value)
@@ -81,12 +144,28 @@ class AndCondition(Condition):
         self.child = name.pop()
         self.conditions = conditions
 
+    @property
+    def names(self):
+        return frozenset().union(*(cond.names for cond in self.conditions))
+
+    def prefixed(self, prefix):
+        return type(self)(*(cond.prefixed(prefix) for cond in self.conditions))
+
     def is_active(self, **kwargs):
+        return self.evaluate(kwargs)
+
+    def evaluate(self, params):
         for condition in self.conditions:
-            if not condition.is_active(**kwargs):
+            if not condition.evaluate(params):
                 return False
         return True
 
+    def active_mask(self, columns):
+        mask = columns.full(True)
+        for condition in self.conditions:
+            mask &= condition.active_mask(columns)
+        return mask
+
     def __repr__(self):
         return " & ".join("({})".format(c) for c in self.conditions)
 
@@ -99,11 +178,27 @@ class OrCondition(Condition):
         self.child = name.pop()
         self.conditions = conditions
 
+    @property
+    def names(self):
+        return frozenset().union(*(cond.names for cond in self.conditions))
+
+    def prefixed(self, prefix):
+        return type(self)(*(cond.prefixed(prefix) for cond in self.conditions))
+
     def is_active(self, **kwargs):
+        return self.evaluate(kwargs)
+
+    def evaluate(self, params):
         for condition in self.conditions:
-            if condition.is_active(**kwargs):
+            if condition.evaluate(params):
                 return True
         return False
 
+    def active_mask(self, columns):
+        mask = columns.full(False)
+        for condition in self.conditions:
+            mask |= condition.active_mask(columns)
+        return mask
+
     def __repr__(self):
         return " | ".join("({})".format(c) for c in self.conditions)
@@ -0,0 +1,26 @@
+from types import MappingProxyType
+from weakref import WeakKeyDictionary
+
+_default_params_cache = WeakKeyDictionary()
+
+
+def get_default_params(estimator_cls):
+    """Return the default parameters of ``estimator_cls`` as a read only
+    mapping.
+
+    The estimator is instantiated once per class. The cached parameters are
+    dropped when the class is garbage collected or when its ``__init__`` is
+    replaced.
+    """
+    init = estimator_cls.__init__
+    cached = _default_params_cache.get(estimator_cls)
+    if cached is not None and cached[0] is init:
+        return cached[1]
+
+    params = MappingProxyType(estimator_cls().get_params())
+    _default_params_cache[estimator_cls] = (init, params)
+    return params
+
+
+def clear_default_params_cache():
+    _default_params_cache.clear()
@@ -1,19 +1,37 @@
 from abc import ABCMeta
 from inspect import getfullargspec
+from operator import itemgetter
+from weakref import WeakKeyDictionary
 
-from ConfigSpace import EqualsCondition
-from ConfigSpace.hyperparameters import CategoricalHyperparameter
-from ConfigSpace.hyperparameters import UniformIntegerHyperparameter
-from ConfigSpace.hyperparameters import UniformFloatHyperparameter
-from ConfigSpace.hyperparameters import Constant
+import numpy as np
+
+from .samples import ArrayColumn
+from .samples import CodedColumn
+from .samples import ConstantColumn
+from .samples import UnionColumn
+
+# Integer ranges with more values are treated as continuous by support
+_MAX_INT_SUPPORT = 1024
+
+_field_names_cache = WeakKeyDictionary()
+
+
+def _field_names(dist_cls):
+    # Names of the __init__ arguments, cached until __init__ is replaced
+    init = dist_cls.__init__
+    cached = _field_names_cache.get(dist_cls)
+    if cached is not None and cached[0] is init:
+        return cached[1]
+    arg_spec = getfullargspec(init)
+    args = arg_spec.args[1:]
+    args.extend(arg_spec.kwonlyargs)
+    _field_names_cache[dist_cls] = (init, tuple(args))
+    return tuple(args)
 
 
 class BaseDistribution(metaclass=ABCMeta):
     def to_dict(self):
-        arg_spec = getfullargspec(self.__init__)
-        args = arg_spec.args[1:]
-        args.extend(arg_spec.kwonlyargs)
-        output = {arg: getattr(self, arg) for arg in args}
+        output = {arg: getattr(self, arg) for arg in _field_names(type(self))}
         output['type'] = self.__class__.__name__
         return output
 
@@ -35,6 +53,12 @@ class BaseDistribution(metaclass=ABCMeta):
             config_space_dict[name] = value
         return config_space_dict
 
+    def config_space_reader(self, name):
+        """Return a function reading the value of ``name`` from a
+        ConfigSpace configuration dict, raising KeyError when it is not
+        active. Same as ``post_process`` without modifying the dict."""
+        return itemgetter(name)
+
     def value_to_name_value(self, name, value):
         return (name, value)
 
@@ -44,6 +68,42 @@ class BaseDistribution(metaclass=ABCMeta):
     def is_constant(self):
         return False
 
+    def sample_column(self, n, rng):
+        """Draw ``n`` values with the numpy Generator ``rng``, returns an
+        encoded column such as ``skconfig.samples.ArrayColumn``."""
+        raise NotImplementedError(
+            "{} does not support array sampling".format(
+                self.__class__.__name__))
+
+    def sample_array(self, n, rng):
+        """Draw ``n`` values with the numpy Generator ``rng``."""
+        return self.sample_column(n, rng).decode(n)
+
+    # Number of dimensions of the unit hypercube used by from_unit
+    unit_dims = 1
+
+    def from_unit(self, points):
+        """Map points of the unit hypercube, an array of shape
+        ``(n, unit_dims)``, to an encoded column."""
+        raise NotImplementedError(
+            "{} does not support quasi random sampling".format(
+                self.__class__.__name__))
+
+    def encode(self, values):
+        """Encode a list of values of the distribution into a column."""
+        return ArrayColumn(np.array(values, dtype=getattr(self, 'dtype',
+                                                          object)))
+
+    def support(self):
+        """Finite set of values as a tuple ``(values, probabilities)``, or
+        None when the distribution is continuous or too large."""
+        return None
+
+    def support_column(self, indices):
+        """Encoded column of the values at ``indices`` of ``support``."""
+        raise NotImplementedError(
+            "{} has no finite support".format(self.__class__.__name__))
+
 
 class UnionDistribution(BaseDistribution):
     def __init__(self, *dists, **kwargs):
@@ -68,6 +128,9 @@ class UnionDistribution(BaseDistribution):
         return cls(*dist_objs)
 
     def add_to_config_space(self, name, cs):
+        from ConfigSpace import EqualsCondition
+        from ConfigSpace.hyperparameters import CategoricalHyperparameter
+
         control_name = "{}:control".format(name)
 
         type_name_to_dist = self.type_name_to_dist(name)
@@ -75,10 +138,10 @@ class UnionDistribution(BaseDistribution):
         control = CategoricalHyperparameter(
             name=control_name, choices=type_names, default_value=type_names[0])
 
-        cs.add_hyperparameter(control)
+        cs.add(control)
         for type_name, dist in type_name_to_dist.items():
             cs_hp = dist.add_to_config_space(type_name, cs)
-            cs.add_condition(EqualsCondition(cs_hp, control, type_name))
+            cs.add(EqualsCondition(cs_hp, control, type_name))
 
     def post_process(self, name, config_space_dict):
         type_name_to_dist = self.type_name_to_dist(name)
@@ -93,6 +156,18 @@ class UnionDistribution(BaseDistribution):
         del config_space_dict[control_value]
         return config_space_dict
 
+    def config_space_reader(self, name):
+        control_name = "{}:control".format(name)
+        readers = {
+            type_name: dist.config_space_reader(type_name)
+            for type_name, dist in self.type_name_to_dist(name).items()
+        }
+
+        def read(config):
+            return readers[config[control_name]](config)
+
+        return read
+
     def type_name_to_dist(self, name):
         type_name_to_dist = {}
         for dist in self.dists:
@@ -125,6 +200,57 @@ class UnionDistribution(BaseDistribution):
                 return dist.in_distrubution(value)
         return False
 
+    def _union_column(self, branches, branch_columns):
+        columns = []
+        for i, column in enumerate(branch_columns):
+            columns.append(column.scatter(branches == i))
+        return UnionColumn(branches, columns)
+
+    def sample_column(self, n, rng):
+        branches = rng.integers(len(self.dists), size=n).astype(
+            np.min_scalar_type(len(self.dists) - 1))
+        return self._union_column(branches, [
+            dist.sample_column(int(np.count_nonzero(branches == i)), rng)
+            for i, dist in enumerate(self.dists)
+        ])
+
+    @property
+    def unit_dims(self):
+        return 1 + sum(dist.unit_dims for dist in self.dists)
+
+    def from_unit(self, points):
+        # The first dimension selects the branch, every branch maps the
+        # points of its own dimensions
+        n_dists = len(self.dists)
+        branches = np.minimum(points[:, 0] * n_dists, n_dists - 1).astype(
+            np.min_scalar_type(n_dists - 1))
+        columns = []
+        start = 1
+        for dist in self.dists:
+            stop = start + dist.unit_dims
+            columns.append(dist.from_unit(points[:, start:stop]))
+            start = stop
+        return UnionColumn(branches, columns)
+
+    def encode(self, values):
+        branches = np.empty(
+            len(values), dtype=np.min_scalar_type(len(self.dists) - 1))
+        branch_values = [[] for _ in self.dists]
+        for row, value in enumerate(values):
+            for i, dist in enumerate(self.dists):
+                if (isinstance(value, dist.dtype)
+                        and dist.in_distrubution(value)):
+                    break
+            else:
+                raise ValueError(
+                    "{} is not in the distribution {}".format(value, self))
+            branches[row] = i
+            branch_values[i].append(value)
+        return self._union_column(branches, [
+            dist.encode(dist_values)
+            for dist, dist_values in zip(self.dists, branch_values)
+        ])
+
 
 class UniformBoolDistribution(BaseDistribution):
     dtype = bool
@@ -133,10 +259,12 @@ class UniformBoolDistribution(BaseDistribution):
         self.default = default
 
     def add_to_config_space(self, name, cs):
+        from ConfigSpace.hyperparameters import CategoricalHyperparameter
+
         default_value = 'T' if self.default else 'F'
         hp = CategoricalHyperparameter(
             name=name, choices=['T', 'F'], default_value=default_value)
-        cs.add_hyperparameter(hp)
+        cs.add(hp)
         return hp
 
     def post_process(self, name, config_space_dict, value=None):
@@ -144,10 +272,32 @@ class UniformBoolDistribution(BaseDistribution):
         config_space_dict[name] = value == 'T'
         return config_space_dict
 
+    def config_space_reader(self, name):
+        def read(config):
+            return config[name] == 'T'
+
+        return read
+
     def in_distrubution(self, value):
         return value in [True, False]
 
-    def value_to_name(self, name, value):
+    def sample_column(self, n, rng):
+        return CodedColumn.from_codes(rng.random(n) < 0.5, (False, True))
+
+    def from_unit(self, points):
+        return CodedColumn.from_codes(points[:, 0] < 0.5, (False, True))
+
+    def encode(self, values):
+        return CodedColumn.from_codes(np.array(values, dtype=bool),
+                                      (False, True))
+
+    def support(self):
+        return (False, True), np.array([0.5, 0.5])
+
+    def support_column(self, indices):
+        return CodedColumn.from_codes(indices, (False, True))
+
+    def value_to_name_value(self, name, value):
         if value:
             return name, 'T'
         return name, 'F'
@@ -163,18 +313,67 @@ class UniformIntDistribution(BaseDistribution):
         self.default = self.lower if default is None else default
 
     def add_to_config_space(self, name, cs):
+        from ConfigSpace.hyperparameters import UniformIntegerHyperparameter
+
         hp = UniformIntegerHyperparameter(
             name=name,
             lower=self.lower,
             upper=self.upper,
             log=self.log,
             default_value=self.default)
-        cs.add_hyperparameter(hp)
+        cs.add(hp)
         return hp
 
     def in_distrubution(self, value):
         return self.lower <= value <= self.upper
 
+    def _log_edges(self):
+        # Same as ConfigSpace 1.x: values are drawn log uniformly in
+        # [lower, upper] and [lower, upper] is split into one bin per integer
+        n_values = self.upper - self.lower + 1
+        return self.lower + np.arange(n_values + 1) * (
+            (self.upper - self.lower) / n_values)
+
+    def sample_column(self, n, rng):
+        if not self.log:
+            return ArrayColumn(rng.integers(self.lower, self.upper + 1,
+                                            size=n))
+        return self.from_unit(rng.random((n, 1)))
+
+    def from_unit(self, points):
+        unit = points[:, 0]
+        if not self.log:
+            values = self.lower + np.floor(
+                unit * (self.upper - self.lower + 1))
+        else:
+            lower, upper = np.log(self.lower), np.log(self.upper)
+            edges = self._log_edges()
+            values = self.lower + np.searchsorted(
+                edges, np.exp(lower + unit * (upper - lower)),
+                side='right') - 1
+        return ArrayColumn(
+            np.clip(values, self.lower, self.upper).astype(np.int64))
+
+    def encode(self, values):
+        return ArrayColumn(np.array(values, dtype=np.int64))
+
+    def support(self):
+        n_values = self.upper - self.lower + 1
+        if n_values > _MAX_INT_SUPPORT:
+            return None
+        values = np.arange(self.lower, self.upper + 1, dtype=np.int64)
+        if not self.log:
+            return tuple(values.tolist()), np.full(n_values, 1 / n_values)
+        if n_values == 1:
+            return tuple(values.tolist()), np.ones(1)
+        # Log uniform mass of the bin of every integer
+        edges = np.log(self._log_edges())
+        probabilities = np.diff(edges) / (edges[-1] - edges[0])
+        return tuple(values.tolist()), probabilities
+
+    def support_column(self, indices):
+        return ArrayColumn(self.lower + indices.astype(np.int64))
+
 
 class UniformFloatDistribution(BaseDistribution):
     dtype = float
@@ -186,18 +385,37 @@ class UniformFloatDistribution(BaseDistribution):
         self.default = self.lower if default is None else default
 
     def add_to_config_space(self, name, cs):
+        from ConfigSpace.hyperparameters import UniformFloatHyperparameter
+
         hp = UniformFloatHyperparameter(
             name=name,
             lower=self.lower,
             upper=self.upper,
             log=self.log,
             default_value=self.default)
-        cs.add_hyperparameter(hp)
+        cs.add(hp)
         return hp
 
     def in_distrubution(self, value):
         return self.lower <= value <= self.upper
 
+    def sample_column(self, n, rng):
+        if not self.log:
+            return ArrayColumn(rng.uniform(self.lower, self.upper, size=n))
+        return ArrayColumn(
+            np.exp(rng.uniform(np.log(self.lower), np.log(self.upper),
+                               size=n)))
+
+    def from_unit(self, points):
+        unit = points[:, 0]
+        if not self.log:
+            return ArrayColumn(self.lower + unit * (self.upper - self.lower))
+        lower, upper = np.log(self.lower), np.log(self.upper)
+        return ArrayColumn(np.exp(lower + unit * (upper - lower)))
+
+    def encode(self, values):
+        return ArrayColumn(np.array(values, dtype=np.float64))
+
 
 class CategoricalDistribution(BaseDistribution):
     dtype = str
@@ -207,14 +425,37 @@ class CategoricalDistribution(BaseDistribution):
         self.default = self.choices[0] if default is None else default
 
     def add_to_config_space(self, name, cs):
+        from ConfigSpace.hyperparameters import CategoricalHyperparameter
+
         hp = CategoricalHyperparameter(
             name=name, choices=self.choices, default_value=self.default)
-        cs.add_hyperparameter(hp)
+        cs.add(hp)
         return hp
 
     def in_distrubution(self, value):
         return value in self.choices
 
+    def sample_column(self, n, rng):
+        return CodedColumn.from_codes(
+            rng.integers(len(self.choices), size=n), self.choices)
+
+    def from_unit(self, points):
+        n_choices = len(self.choices)
+        codes = np.minimum(points[:, 0] * n_choices, n_choices - 1)
+        return CodedColumn.from_codes(codes.astype(np.intp), self.choices)
+
+    def encode(self, values):
+        codes = np.fromiter(
+            map(self.choices.index, values), dtype=np.intp, count=len(values))
+        return CodedColumn.from_codes(codes, self.choices)
+
+    def support(self):
+        n_choices = len(self.choices)
+        return tuple(self.choices), np.full(n_choices, 1 / n_choices)
+
+    def support_column(self, indices):
+        return CodedColumn.from_codes(indices, self.choices)
+
 
 class ConstantDistribution(BaseDistribution):
     def __init__(self, value, **kwargs):
@@ -230,30 +471,63 @@ class ConstantDistribution(BaseDistribution):
         return cls(**p_dict)
 
     def add_to_config_space(self, name, cs):
+        from ConfigSpace.hyperparameters import Constant
+
         if self.value is None:
             hp = Constant(name, type(None).__name__)
         else:
             hp = Constant(name, self.value)
-        cs.add_hyperparameter(hp)
+        cs.add(hp)
         return hp
 
     def post_process(self, name, config_space_dict, value=None):
         config_space_dict[name] = self.value
         return config_space_dict
 
+    def config_space_reader(self, name):
+        value = self.value
+
+        def read(config):
+            if name not in config:
+                raise KeyError(name)
+            return value
+
+        return read
+
     def in_distrubution(self, value):
         return self.value == value
 
     def is_constant(self):
         return True
 
+    unit_dims = 0
 
-def load_dist_dict(dist_dict):
-    supported_dists = [
+    def sample_column(self, n, rng):
+        return ConstantColumn(self.value)
+
+    def from_unit(self, points):
+        return ConstantColumn(self.value)
+
+    def encode(self, values):
+        return ConstantColumn(self.value)
+
+    def support(self):
+        return (self.value, ), np.ones(1)
+
+    def support_column(self, indices):
+        return ConstantColumn(self.value)
+
+
+_DIST_TYPES = {
+    dist_cls.__name__: dist_cls
+    for dist_cls in [
         UniformBoolDistribution, UniformIntDistribution,
         UniformFloatDistribution, CategoricalDistribution,
         ConstantDistribution, UnionDistribution
     ]
-    name_to_dist_cls = {d.__name__: d for d in supported_dists}
-    dist_cls = name_to_dist_cls[dist_dict['type']]
+}
+
+
+def load_dist_dict(dist_dict):
+    dist_cls = _DIST_TYPES[dist_dict['type']]
     return dist_cls.from_dict(dist_dict)
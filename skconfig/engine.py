@@ -0,0 +1,362 @@
+import warnings
+from time import perf_counter
+
+import numpy as np
+
+from . import instrumentation
+from .batch import Column
+from .batch import ColumnSet
+from .exceptions import SKConfigValueError
+from .samples import SampleBatch
+
+
+class ConfigSpaceEngine:
+    """Samples from the ConfigSpace ``ConfigurationSpace`` of a Sampler.
+
+    The readers turning ConfigSpace configurations into parameters are
+    compiled once, so names such as the union control keys are not
+    formatted for every sample.
+    """
+
+    def __init__(self, sampler):
+        self.sampler = sampler
+        self.readers = [(name, sampler.hps[name].config_space_reader(name))
+                        for name in sampler.active_params]
+
+    def to_params(self, config):
+        params = {}
+        for name, read in self.readers:
+            try:
+                params[name] = read(config)
+            except KeyError:
+                # Inactive conditioned parameter
+                pass
+        return params
+
+    def sample(self, size):
+        recorder = instrumentation.recorder
+        if recorder is not None:
+            start = perf_counter()
+        sampler = self.sampler
+        config_space = sampler.config_space
+        # The space is shared by the samplers with the same spec, each
+        # samples with its own random state while holding the lock
+        with sampler.config_space_lock:
+            config_space.random = sampler._cs_random
+            configs = config_space.sample_configuration(size)
+        if size == 1:
+            configs = [configs]
+        to_params = self.to_params
+        output = [to_params(dict(config)) for config in configs]
+        if recorder is not None:
+            # ConfigSpace does not report how many samples it rejected
+            recorder.record_batch('configspace', size, None,
+                                  perf_counter() - start)
+        return output
+
+    def sample_batch(self, size):
+        sampler = self.sampler
+        hps = {name: sampler.hps[name] for name in sampler.active_params}
+        return SampleBatch.from_records(self.sample(size), hps)
+
+
+def _order_conditions(conditions):
+    # Group conditions by child, parents before their children
+    by_child = {}
+    for cond in conditions:
+        by_child.setdefault(cond.child, []).append(cond)
+
+    ordered = []
+    while by_child:
+        ready = [
+            child for child, conds in by_child.items()
+            if all(parent == child or parent not in by_child
+                   for cond in conds for parent in cond.names)
+        ]
+        if not ready:
+            raise SKConfigValueError(
+                "conditions have a cycle: {}".format(sorted(by_child)))
+        for child in ready:
+            conds = by_child.pop(child)
+            parents = frozenset().union(*(cond.names for cond in conds))
+            ordered.append((child, conds, parents - {child}))
+    return ordered
+
+
+class NumpyEngine:
+    """Draws whole columns with ``BaseDistribution.sample_column``.
+
+    Conditioned parameters are dropped from the rows where their condition
+    is not active, or where one of their parents is inactive. Rows hitting
+    an active forbidden clause are rejected. The acceptance rate observed so
+    far sizes the next batch, so ``sample`` usually needs one or two rounds,
+    and sampling fails once the rate is below ``min_acceptance_rate``.
+
+    Forbiddens that only depend on unconditioned parameters with a finite
+    ``support`` are not rejected. The feasible assignments of those
+    parameters are enumerated once when there are at most
+    ``max_feasible_size`` combinations, and drawn directly with
+    ``feasible_weights``: ``'marginal'`` weighs them by the product of their
+    marginal probabilities, which matches rejection sampling, ``'uniform'``
+    draws every feasible assignment equally often.
+    """
+    oversampling = 1.2
+    max_batch_size = 1000000
+    min_acceptance_rate = 1e-4
+    enumerate_feasible = True
+
+    def __init__(self, sampler, feasible_weights='marginal',
+                 max_feasible_size=100000):
+        if feasible_weights not in ('marginal', 'uniform'):
+            raise SKConfigValueError(
+                "feasible_weights must be 'marginal' or 'uniform'")
+        self.sampler = sampler
+        self.rng = sampler._rng
+        self.names = list(sampler.active_params)
+        self.conditions = _order_conditions(sampler.active_conditions)
+        self.forbiddens = list(sampler.active_forbiddens)
+        self.feasible_weights = feasible_weights
+        self.max_feasible_size = max_feasible_size
+        self.feasible = None
+        if self.enumerate_feasible:
+            self._enumerate_feasible()
+        self.n_drawn = 0
+        self.n_accepted = 0
+
+    def _enumerate_feasible(self):
+        hps = self.sampler.hps
+        conditioned = {cond.child for cond in self.sampler.active_conditions}
+        supports = {}
+        exact, rejected = [], []
+        for forb in self.forbiddens:
+            for name in forb.names:
+                if name not in supports:
+                    supports[name] = (None if name in conditioned else
+                                      hps[name].support())
+            finite = all(supports[name] is not None for name in forb.names)
+            (exact if finite else rejected).append(forb)
+        if not exact:
+            return
+
+        names = [
+            name for name in self.names
+            if any(name in forb.names for forb in exact)
+        ]
+        sizes = [len(supports[name][0]) for name in names]
+        if int(np.prod(sizes, dtype=float)) > self.max_feasible_size:
+            return
+
+        # Every combination of the support indices, one row per name
+        grid = np.indices(sizes).reshape(len(sizes), -1)
+        n = grid.shape[1]
+        column_set = ColumnSet({
+            name: Column(hps[name].support_column(indices).decode(n))
+            for name, indices in zip(names, grid)
+        }, {}, n)
+        forbidden = np.zeros(n, dtype=bool)
+        for forb in exact:
+            forbidden |= forb.forbidden_mask(column_set)
+        if forbidden.all():
+            raise SKConfigValueError(
+                "Every assignment of {} is forbidden".format(
+                    ", ".join(names)))
+
+        grid = grid[:, ~forbidden]
+        probabilities = None
+        if self.feasible_weights == 'marginal':
+            probabilities = np.ones(grid.shape[1])
+            for name, indices in zip(names, grid):
+                probabilities *= supports[name][1][indices]
+            probabilities /= probabilities.sum()
+        self.feasible = (names, grid, probabilities)
+        self.forbiddens = rejected
+
+    @property
+    def acceptance_rate(self):
+        # Laplace estimate, starts at 1/2 until rows are drawn
+        return (self.n_accepted + 1) / (self.n_drawn + 2)
+
+    def _batch_size(self, remaining):
+        if not self.forbiddens:
+            return remaining
+        rate = 1.0 if not self.n_drawn else self.acceptance_rate
+        size = int(np.ceil(remaining * self.oversampling / rate))
+        return min(max(size, remaining), self.max_batch_size)
+
+    def draw_columns(self, n, rng):
+        """Encoded column of every active parameter."""
+        hps = self.sampler.hps
+        if self.feasible is None:
+            return {
+                name: hps[name].sample_column(n, rng)
+                for name in self.names
+            }
+
+        names, grid, probabilities = self.feasible
+        rows = rng.choice(grid.shape[1], size=n, p=probabilities)
+        enumerated = {
+            name: hps[name].support_column(indices[rows])
+            for name, indices in zip(names, grid)
+        }
+        return {
+            name: enumerated[name]
+            if name in enumerated else hps[name].sample_column(n, rng)
+            for name in self.names
+        }
+
+    def draw(self, n, rng=None):
+        """Draw ``n`` rows, returns a ``SampleBatch`` and the mask of the
+        rows that are not forbidden."""
+        recorder = instrumentation.recorder
+        if recorder is not None:
+            start = perf_counter()
+        encoded = self.draw_columns(n, self.rng if rng is None else rng)
+        columns = {
+            name: Column(column.decode(n))
+            for name, column in encoded.items()
+        }
+        column_set = ColumnSet(columns, {}, n)
+
+        active = {}
+        for child, conds, parents in self.conditions:
+            child_active = column_set.full(True)
+            for cond in conds:
+                child_active &= cond.active_mask(column_set)
+            for parent in parents:
+                missing = column_set[parent].missing
+                if missing is not None:
+                    child_active &= ~missing
+            columns[child].missing = ~child_active
+            active[child] = child_active
+
+        forbidden = column_set.full(False)
+        rejections = {}
+        for forb in self.forbiddens:
+            mask = forb.forbidden_mask(column_set)
+            if recorder is not None:
+                rejections[repr(forb)] = int(np.count_nonzero(mask))
+            forbidden |= mask
+        accepted = ~forbidden
+        if recorder is not None:
+            recorder.record_batch('numpy', n,
+                                  int(np.count_nonzero(accepted)),
+                                  perf_counter() - start, rejections)
+        return SampleBatch(encoded, active, n), accepted
+
+    def sample_batch(self, size):
+        batches = []
+        n_sampled = 0
+        while n_sampled < size:
+            if self.acceptance_rate < self.min_acceptance_rate:
+                raise SKConfigValueError(
+                    "Only {} of {} sampled configurations are not "
+                    "forbidden, the forbiddens exclude almost all of the "
+                    "distributions".format(self.n_accepted, self.n_drawn))
+            remaining = size - n_sampled
+            n = self._batch_size(remaining)
+            batch, accepted = self.draw(n)
+            self.n_drawn += n
+            self.n_accepted += int(np.count_nonzero(accepted))
+
+            # Extra accepted rows are dropped, rows are independent
+            accepted[np.flatnonzero(accepted)[remaining:]] = False
+            batch = batch.take(accepted)
+            batches.append(batch)
+            n_sampled += len(batch)
+        if len(batches) == 1:
+            return batches[0]
+        return SampleBatch.concatenate(batches)
+
+    def sample(self, size):
+        return self.sample_batch(size).to_records()
+
+    def sample_at(self, indices, key):
+        """Sample number ``index`` for each of ``indices``.
+
+        Every index draws from its own Philox stream, with ``key`` and the
+        index in the high word of the counter, and rejects forbidden rows
+        one at a time, so the sample only depends on ``key`` and the index.
+        """
+        max_attempts = int(np.ceil(1 / self.min_acceptance_rate))
+        output = []
+        for index in indices:
+            rng = np.random.Generator(
+                np.random.Philox(counter=[0, 0, 0, index], key=key))
+            for _ in range(max_attempts):
+                batch, accepted = self.draw(1, rng)
+                if accepted[0]:
+                    output.append(batch[0])
+                    break
+            else:
+                raise SKConfigValueError(
+                    "Unable to draw sample {} that is not forbidden".format(
+                        index))
+        return output
+
+
+class QMCEngine(NumpyEngine):
+    """Draws from a scrambled low discrepancy sequence of
+    ``scipy.stats.qmc`` and maps it with ``BaseDistribution.from_unit``.
+
+    Every parameter uses ``unit_dims`` dimensions of the sequence. Points
+    are consumed in order across batches, forbidden rows are rejected like
+    in ``NumpyEngine``. ``options`` listed in ``qmc_options``, e.g.
+    ``scramble``, are passed to the scipy engine.
+    """
+    qmc_engine = None
+    qmc_options = ('scramble', 'optimization')
+    # The sequence covers every parameter, forbiddens are always rejected
+    enumerate_feasible = False
+
+    def __init__(self, sampler, **options):
+        unknown = sorted(set(options).difference(self.qmc_options))
+        if unknown:
+            raise SKConfigValueError(
+                "Unknown options {} for the {} engine, expected some of {}"
+                .format(unknown, sampler.engine, sorted(self.qmc_options)))
+        super().__init__(sampler)
+        try:
+            from scipy.stats import qmc
+        except ImportError:
+            raise ImportError(
+                "The {} engine requires scipy >= 1.7".format(sampler.engine))
+
+        hps = sampler.hps
+        self.offsets = []
+        n_dims = 0
+        for name in self.names:
+            dims = hps[name].unit_dims
+            self.offsets.append((name, n_dims, n_dims + dims))
+            n_dims += dims
+
+        engine_cls = getattr(qmc, self.qmc_engine)
+        # Older scipy releases name the rng argument seed
+        try:
+            self.sequence = engine_cls(max(n_dims, 1), rng=self.rng, **options)
+        except TypeError:
+            self.sequence = engine_cls(max(n_dims, 1), seed=self.rng,
+                                       **options)
+
+    def draw_columns(self, n, rng):
+        if rng is not self.rng:
+            # Counter based draws from sample_at
+            return super().draw_columns(n, rng)
+        with warnings.catch_warnings():
+            # Sobol warns when n is not a power of two
+            warnings.simplefilter('ignore', UserWarning)
+            points = self.sequence.random(n)
+        hps = self.sampler.hps
+        return {
+            name: hps[name].from_unit(points[:, start:stop])
+            for name, start, stop in self.offsets
+        }
+
+
+class SobolEngine(QMCEngine):
+    qmc_engine = 'Sobol'
+    qmc_options = QMCEngine.qmc_options + ('bits',)
+
+
+class LatinHypercubeEngine(QMCEngine):
+    qmc_engine = 'LatinHypercube'
+    qmc_options = QMCEngine.qmc_options + ('strength',)
@@ -8,12 +8,21 @@ class InvalidParam(SKConfigValueError):
 
 class InvalidParamName(InvalidParam):
     def __init__(self, name):
-        super().__init__("{} is a invalid parameter name".format(name))
+        super().__init__(name)
+        self.name = name
+
+    def __str__(self):
+        return "{} is a invalid parameter name".format(self.name)
 
 
 class InvalidParamType(InvalidParam):
     def __init__(self, name, correct_type):
-        super().__init__("{} must be of type {}".format(name, correct_type))
+        super().__init__(name, correct_type)
+        self.name = name
+        self.correct_type = correct_type
+
+    def __str__(self):
+        return "{} must be of type {}".format(self.name, self.correct_type)
 
 
 class InvalidParamRange(InvalidParam):
@@ -26,39 +35,106 @@ class InvalidParamRange(InvalidParam):
                  include_upper=True):
         if lower is None and upper is None:
             raise ValueError("Lower and uppoer bounds cannot both be None")
-
-        msg_list = ["{} with value {} not in range:".format(name, value)]
-        if lower is not None:
-            if include_lower:
-                lower_str = "[{},".format(lower)
+        super().__init__(name, value, lower, upper, include_lower,
+                         include_upper)
+        self.name = name
+        self.value = value
+        self.lower = lower
+        self.upper = upper
+        self.include_lower = include_lower
+        self.include_upper = include_upper
+
+    def __str__(self):
+        msg_list = ["{} with value {} not in range:".format(
+            self.name, self.value)]
+        if self.lower is not None:
+            if self.include_lower:
+                lower_str = "[{},".format(self.lower)
             else:
-                lower_str = "({},".format(lower)
+                lower_str = "({},".format(self.lower)
             msg_list.append(lower_str)
         else:
             msg_list.append("(-inf")
 
-        if upper is not None:
-            if include_upper:
-                upper_str = "{}]".format(upper)
+        if self.upper is not None:
+            if self.include_upper:
+                upper_str = "{}]".format(self.upper)
             else:
-                upper_str = "{})".format(upper)
+                upper_str = "{})".format(self.upper)
             msg_list.append(upper_str)
         else:
             msg_list.append("inf)")
-        super().__init__(" ".join(msg_list))
+        return " ".join(msg_list)
 
 
 class InvalidParamChoices(InvalidParam):
     def __init__(self, name, choices):
-        super().__init__("{} must be one of {}".format(name, choices))
+        super().__init__(name, choices)
+        self.name = name
+        self.choices = choices
+
+    def __str__(self):
+        return "{} must be one of {}".format(self.name, self.choices)
 
 
 class ForbiddenValue(SKConfigValueError):
     def __init__(self, name, value):
-        super().__init__("{} with value {} is forbidden".format(name, value))
+        super().__init__(name, value)
+        self.name = name
+        self.value = value
+
+    def __str__(self):
+        # ForbiddenAnd passes one name and value per clause
+        if isinstance(self.name, tuple):
+            return "{} with value {} is forbidden".format(
+                " and ".join(self.name),
+                " and ".join(str(v) for v in self.value))
+        return "{} with value {} is forbidden".format(self.name, self.value)
 
 
 class InactiveConditionedValue(SKConfigValueError):
     def __init__(self, name, condition):
-        super().__init__("{} has an unmet condition: {}".format(
-            name, condition))
+        super().__init__(name, condition)
+        self.name = name
+        self.condition = condition
+
+    def __str__(self):
+        return "{} has an unmet condition: {}".format(self.name,
+                                                      self.condition)
+
+
+class Violation:
+    """Lightweight record of a failed check.
+
+    Stores the exception class and its arguments; the exception and its
+    message are only built when asked for.
+    """
+    __slots__ = ('error_cls', 'args', '_exception')
+
+    def __init__(self, error_cls, *args):
+        self.error_cls = error_cls
+        self.args = args
+        self._exception = None
+
+    @classmethod
+    def from_exception(cls, exception):
+        violation = cls(type(exception), *exception.args)
+        violation._exception = exception
+        return violation
+
+    @property
+    def name(self):
+        return self.args[0] if self.args else None
+
+    @property
+    def message(self):
+        return str(self.exception())
+
+    def exception(self):
+        if self._exception is not None:
+            return self._exception
+        return self.error_cls(*self.args)
+
+    def __repr__(self):
+        return "Violation({}: {})".format(self.error_cls.__name__,
+                                          self.message)
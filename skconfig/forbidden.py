@@ -1,5 +1,6 @@
 from abc import ABCMeta, abstractmethod
 from .exceptions import ForbiddenValue
+from .exceptions import Violation
 
 
 class ForbiddenClause(metaclass=ABCMeta):
@@ -11,6 +12,36 @@ class ForbiddenClause(metaclass=ABCMeta):
     def is_forbidden(self, **kwargs):
         ...
 
+    @property
+    def names(self):
+        """Parameter names this clause depends on."""
+        return frozenset([self.name])
+
+    def matches(self, params):
+        """Return True when ``params`` is forbidden by this clause."""
+        return self.violation(params) is not None
+
+    def violation(self, params):
+        """Return a ``Violation`` when ``params`` is forbidden, else None."""
+        try:
+            self.is_forbidden(**params)
+        except ForbiddenValue as exc:
+            return Violation.from_exception(exc)
+
+    def check(self, params):
+        """Same as ``is_forbidden`` with the parameters passed as a dict."""
+        violation = self.violation(params)
+        if violation is not None:
+            raise violation.exception()
+
+    def forbidden_mask(self, columns):
+        """Boolean mask of the forbidden rows of a ``ColumnSet``."""
+        return columns.map_rows(self.matches)
+
+    def prefixed(self, prefix):
+        """Copy of the clause with ``prefix`` added to every name."""
+        return type(self)(prefix + self.name, self.value)
+
     def __repr__(self):
         return "{self.__class__.__name__}: {self.name}, {self.value}".format(
             self=self)
@@ -18,43 +49,84 @@ class ForbiddenClause(metaclass=ABCMeta):
 
 class ForbiddenIn(ForbiddenClause):
     def is_forbidden(self, **kwargs):
-        value = kwargs.get(self.name)
+        self.check(kwargs)
+
+    def matches(self, params):
+        value = params.get(self.name)
         if value is None:
-            return
-        if value in self.value:
-            raise ForbiddenValue(self.name, value)
+            return False
+        return value in self.value
+
+    def violation(self, params):
+        if self.matches(params):
+            return Violation(ForbiddenValue, self.name, params[self.name])
+
+    def forbidden_mask(self, columns):
+        column = columns[self.name]
+        return ~column.is_none & column.isin(self.value)
 
 
 class ForbiddenEquals(ForbiddenClause):
     def is_forbidden(self, **kwargs):
-        value = kwargs.get(self.name)
+        self.check(kwargs)
+
+    def matches(self, params):
+        value = params.get(self.name)
         if value is None:
-            return
-        if value == self.value:
-            raise ForbiddenValue(self.name, value)
+            return False
+        return value == self.value
+
+    def violation(self, params):
+        if self.matches(params):
+            return Violation(ForbiddenValue, self.name, params[self.name])
+
+    def forbidden_mask(self, columns):
+        column = columns[self.name]
+        return ~column.is_none & column.equals(self.value)
 
 
 class ForbiddenAnd(ForbiddenClause):
     def __init__(self, forbidden_clauses):
         self.forbidden_clauses = forbidden_clauses
 
+    @property
+    def names(self):
+        return frozenset().union(*(clause.names
+                                   for clause in self.forbidden_clauses))
+
     def is_forbidden(self, **kwargs):
-        names = []
-        values = []
-        for for_clauses in self.forbidden_clauses:
-            value = kwargs.get(for_clauses.name)
-            if value is None:
-                return
-            try:
-                for_clauses.is_forbidden(**kwargs)
-            except ForbiddenValue:
-                names.append(for_clauses.name)
-                values.append(for_clauses.value)
-
-        if len(names) == len(self.forbidden_clauses):
-            names_str = " and ".join(names)
-            values_str = " and ".join(str(v) for v in values)
-            raise ForbiddenValue(names_str, values_str)
+        self.check(kwargs)
+
+    def matches(self, params):
+        for clause in self.forbidden_clauses:
+            if not clause.matches(params):
+                return False
+        return True
+
+    def violation(self, params):
+        if self.matches(params):
+            leaves = list(self._leaf_clauses())
+            names = tuple(clause.name for clause in leaves)
+            values = tuple(clause.value for clause in leaves)
+            return Violation(ForbiddenValue, names, values)
+
+    def prefixed(self, prefix):
+        return ForbiddenAnd([
+            clause.prefixed(prefix) for clause in self.forbidden_clauses
+        ])
+
+    def _leaf_clauses(self):
+        for clause in self.forbidden_clauses:
+            if isinstance(clause, ForbiddenAnd):
+                yield from clause._leaf_clauses()
+            else:
+                yield clause
+
+    def forbidden_mask(self, columns):
+        mask = columns.full(True)
+        for clause in self.forbidden_clauses:
+            mask &= clause.forbidden_mask(columns)
+        return mask
 
     def __repr__(self):
         names = []
@@ -0,0 +1,133 @@
+from .exceptions import InvalidParamName
+from .exceptions import Violation
+
+
+def _order_names(names, conditions):
+    # Parents before their children, constrained names before free ones
+    parents = {name: set() for name in names}
+    for child, cond, _, _ in conditions:
+        if child in parents:
+            parents[child].update(
+                name for name in cond.names if name in parents)
+    order = []
+    pending = list(names)
+    while pending:
+        # Conditions referring to each other are left in the given order
+        name = next((name for name in pending
+                     if not parents[name].difference(order)), pending[0])
+        order.append(name)
+        pending.remove(name)
+    return order
+
+
+def _forbidden_check(forbidden):
+    def check(params):
+        return forbidden.violation(params) is None
+
+    return check
+
+
+def _condition_check(child, check, is_active):
+    def check_condition(params):
+        value = params.get(child)
+        if is_active(params):
+            return check(value) is None
+        return value is None
+
+    return check_condition
+
+
+class ValidGrid:
+    """Valid points of the grid spanned by ``choices``, a dict mapping
+    parameter names to lists of values.
+
+    Names are assigned one at a time, parents of conditions first. Every
+    forbidden and condition is checked as soon as all the names it depends
+    on are assigned, so the branches it rules out are never expanded.
+    Parameters that are not in ``choices`` keep their estimator defaults.
+    """
+
+    def __init__(self, validator, choices):
+        plan = validator._plan
+        checkers = plan.checkers
+        for name in choices:
+            if name not in checkers:
+                raise Violation(InvalidParamName, name).exception()
+        self.choices = list(choices)
+        self.defaults = validator.default_params()
+
+        # Values failing the check of their Param are never valid
+        values = {}
+        for name, options in choices.items():
+            check = checkers[name]
+            conditioned = name in plan.conditioned
+            values[name] = [
+                value for value in options if check(value) is None or (
+                    conditioned and value is None)
+            ]
+
+        constrained = set()
+        for forbidden in plan.forbiddens:
+            constrained.update(forbidden.names)
+        for _, cond, _, _ in plan.conditions:
+            constrained.update(cond.names)
+        self.names = _order_names(
+            [name for name in self.choices if name in constrained] +
+            [name for name in self.choices if name not in constrained],
+            plan.conditions)
+        self.values = [values[name] for name in self.names]
+
+        # Checks to run once the name at each position is assigned, the
+        # ones that do not depend on choices run before the first name
+        position = {name: i for i, name in enumerate(self.names)}
+        self.checks = [[] for _ in range(len(self.names) + 1)]
+        clauses = [(forbidden.names, _forbidden_check(forbidden))
+                   for forbidden in plan.forbiddens]
+        clauses.extend(
+            (cond.names | {child}, _condition_check(child, check, is_active))
+            for child, cond, check, is_active in plan.conditions)
+        for names, check in clauses:
+            depth = max((position[name] + 1
+                         for name in names if name in position),
+                        default=0)
+            self.checks[depth].append(check)
+
+        # Defaults outside of choices are checked like validate_params does
+        self.defaults_valid = all(
+            name in checkers and (name in plan.conditioned
+                                  or checkers[name](value) is None)
+            for name, value in self.defaults.items() if name not in choices)
+
+    def _walk(self, depth, stop, params):
+        if depth == stop:
+            yield params
+            return
+        name = self.names[depth]
+        checks = self.checks[depth + 1]
+        for value in self.values[depth]:
+            params[name] = value
+            if all(check(params) for check in checks):
+                yield from self._walk(depth + 1, stop, params)
+
+    def _roots(self, stop):
+        if not self.defaults_valid:
+            return iter(())
+        params = dict(self.defaults)
+        if not all(check(params) for check in self.checks[0]):
+            return iter(())
+        return self._walk(0, stop, params)
+
+    def __iter__(self):
+        for params in self._roots(len(self.names)):
+            yield {name: params[name] for name in self.choices}
+
+    def count(self):
+        """Number of valid points, without expanding the names no check
+        depends on."""
+        stop = max(
+            [depth for depth, checks in enumerate(self.checks) if checks],
+            default=0)
+        n_free = 1
+        for values in self.values[stop:]:
+            n_free *= len(values)
+        return n_free * sum(1 for _ in self._roots(stop))
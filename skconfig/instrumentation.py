@@ -0,0 +1,251 @@
+from collections import deque
+from contextlib import contextmanager
+from threading import Lock
+from time import perf_counter
+from weakref import WeakKeyDictionary
+
+# Nothing is recorded until enable is called, validators and samplers only
+# check that recorder is None
+recorder = None
+
+
+def owner_name(validator_cls):
+    """Label of ``validator_cls`` in the statistics, its module and
+    qualified name so that classes sharing a name are kept apart."""
+    return "{}.{}".format(validator_cls.__module__, validator_cls.__qualname__)
+
+
+class _Stat:
+    __slots__ = ('calls', 'seconds', 'hits')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.hits = 0
+
+    def as_dict(self):
+        return {'calls': self.calls, 'seconds': self.seconds,
+                'hits': self.hits}
+
+
+class _InstrumentedForbiddens:
+    # Evaluates every clause on its own to time it, in declaration order
+    def __init__(self, forbiddens, timed):
+        self.forbiddens = forbiddens
+        self._timed = timed
+
+    def violations(self, params):
+        output = []
+        for violation in self._timed:
+            result = violation(params)
+            if result is not None:
+                output.append(result)
+        return output
+
+
+class _TimedForbidden:
+    def __init__(self, forbidden, violation):
+        self.forbidden = forbidden
+        self.violation = violation
+        self.names = forbidden.names
+
+
+class InstrumentedPlan:
+    """``ValidationPlan`` whose checkers, forbiddens and conditions record
+    their calls, time and hits into a ``Recorder``."""
+
+    def __init__(self, plan, owner, recorder):
+        self.parameters = plan.parameters
+        self.conditioned = plan.conditioned
+        self.dependents = plan.dependents
+        self.checkers = {
+            name: recorder.timed(('params', owner, name), check)
+            for name, check in plan.checkers.items()
+        }
+        self.forbiddens = tuple(
+            _TimedForbidden(
+                forbidden,
+                recorder.timed(
+                    ('forbiddens', owner, "{}: {}".format(i, forbidden)),
+                    forbidden.violation))
+            for i, forbidden in enumerate(plan.forbiddens))
+        self.compiled_forbiddens = _InstrumentedForbiddens(
+            self.forbiddens,
+            [forbidden.violation for forbidden in self.forbiddens])
+        self.conditions = tuple(
+            (child, cond, self.checkers[child],
+             recorder.timed(('conditions', owner, "{}: {}".format(
+                 child, cond)), is_active, count_falsy=True))
+            for child, cond, _, is_active in plan.conditions)
+
+    def reachable(self, names):
+        forbiddens, conditions = [], []
+        for name in names:
+            forbidden_ids, condition_ids = self.dependents.get(
+                name, ((), ()))
+            forbiddens.extend(forbidden_ids)
+            conditions.extend(condition_ids)
+        return ([self.forbiddens[i] for i in sorted(set(forbiddens))],
+                [self.conditions[i] for i in sorted(set(conditions))])
+
+
+class Recorder:
+    """Accumulates statistics, see ``snapshot`` for their layout.
+
+    ``callback`` is called with ``(event, data)`` after every validation
+    (``'validate'``) and every sampled batch (``'sample_batch'``).
+    """
+
+    def __init__(self, callback=None, max_batches=1000):
+        self.callback = callback
+        self._lock = Lock()
+        self._stats = {}
+        self._plans = WeakKeyDictionary()
+        self.failures = {}
+        self.validations = 0
+        self.batches = deque(maxlen=max_batches)
+        self.samples_drawn = 0
+        self.samples_accepted = 0
+        self.forbidden_rejections = {}
+
+    def _stat(self, key):
+        stat = self._stats.get(key)
+        if stat is None:
+            with self._lock:
+                stat = self._stats.setdefault(key, _Stat())
+        return stat
+
+    def timed(self, key, func, count_falsy=False):
+        """Wrap ``func`` to record its calls and time under ``key``. A hit
+        is a call returning something other than None, or a falsy value
+        when ``count_falsy`` is True."""
+        stat = self._stat(key)
+
+        lock = self._lock
+
+        def timed_func(*args):
+            start = perf_counter()
+            result = func(*args)
+            seconds = perf_counter() - start
+            hit = (not result) if count_falsy else (result is not None)
+            with lock:
+                stat.seconds += seconds
+                stat.calls += 1
+                if hit:
+                    stat.hits += 1
+            return result
+
+        return timed_func
+
+    def plan(self, validator):
+        """Instrumented plan of ``validator``, cached per class."""
+        validator_cls = type(validator)
+        plan = validator._plan
+        cached = self._plans.get(validator_cls)
+        if cached is None or cached[0] is not plan:
+            cached = (plan, InstrumentedPlan(plan, owner_name(validator_cls),
+                                             self))
+            self._plans[validator_cls] = cached
+        return cached[1]
+
+    def count_violations(self, owner, violations):
+        """Pass through ``violations`` while counting them by exception
+        type and parameter name."""
+        for violation in violations:
+            name = violation.name
+            if isinstance(name, tuple):
+                # ForbiddenAnd violations name every clause
+                name = " and ".join(name)
+            key = (violation.error_cls.__name__, owner, str(name))
+            with self._lock:
+                self.failures[key] = self.failures.get(key, 0) + 1
+            yield violation
+
+    def measure_validation(self, owner, check, params, collect_all):
+        """Call ``check(params, collect_all)`` and record its outcome."""
+        start = perf_counter()
+        result = check(params, collect_all)
+        seconds = perf_counter() - start
+        with self._lock:
+            self.validations += 1
+        if self.callback is not None:
+            self.callback('validate', {
+                'validator': owner, 'valid': result.valid,
+                'seconds': seconds})
+        return result
+
+    def record_batch(self, engine, drawn, accepted, seconds,
+                     rejections=None):
+        """Record a sampled batch, ``accepted`` is None when the engine
+        does not report rejected samples."""
+        data = {'engine': engine, 'drawn': drawn, 'accepted': accepted,
+                'seconds': seconds}
+        with self._lock:
+            self.batches.append(data)
+            if accepted is not None:
+                self.samples_drawn += drawn
+                self.samples_accepted += accepted
+            for label, count in (rejections or {}).items():
+                self.forbidden_rejections[label] = (
+                    self.forbidden_rejections.get(label, 0) + count)
+        if self.callback is not None:
+            self.callback('sample_batch', data)
+
+    def snapshot(self):
+        """Plain dict of everything recorded so far."""
+        with self._lock:
+            output = {'params': {}, 'forbiddens': {}, 'conditions': {}}
+            for (kind, owner, label), stat in self._stats.items():
+                output[kind].setdefault(owner, {})[label] = stat.as_dict()
+
+            failures = {}
+            for (error, owner, name), count in self.failures.items():
+                failures.setdefault(error, {}).setdefault(owner, {})[
+                    name] = count
+            output['failures'] = failures
+            output['validations'] = self.validations
+
+            acceptance = None
+            if self.samples_drawn:
+                acceptance = self.samples_accepted / self.samples_drawn
+            output['sampler'] = {
+                'batches': [dict(batch) for batch in self.batches],
+                'drawn': self.samples_drawn,
+                'accepted': self.samples_accepted,
+                'acceptance_rate': acceptance,
+                'forbidden_rejections': dict(self.forbidden_rejections),
+            }
+        return output
+
+
+def _set_recorder(value):
+    global recorder
+    recorder = value
+
+
+def enable(callback=None):
+    """Start recording, returns the new ``Recorder``."""
+    current = Recorder(callback)
+    _set_recorder(current)
+    return current
+
+
+def disable():
+    _set_recorder(None)
+
+
+def snapshot():
+    """Snapshot of the current recorder, or None when disabled."""
+    current = recorder
+    return None if current is None else current.snapshot()
+
+
+@contextmanager
+def instrument(callback=None):
+    """Record within a ``with`` block, yields the ``Recorder``."""
+    previous = recorder
+    current = enable(callback)
+    try:
+        yield current
+    finally:
+        _set_recorder(previous)
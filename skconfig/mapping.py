@@ -3,63 +3,55 @@ from .condition import (EqualsCondition, NotEqualsCondition, LessThanCondition,
                         OrCondition)
 from .forbidden import (ForbiddenEquals, ForbiddenIn, ForbiddenAnd)
 
-from ConfigSpace import EqualsCondition as CSEqualsCondition
-from ConfigSpace import NotEqualsCondition as CSNotEqualsCondition
-from ConfigSpace import LessThanCondition as CSLessThanCondition
-from ConfigSpace import GreaterThanCondition as CSGreaterThanCondition
-from ConfigSpace import InCondition as CSInCondition
-from ConfigSpace import AndConjunction as CSAndCondition
-from ConfigSpace import OrConjunction as CSOrCondition
-from ConfigSpace import ForbiddenAndConjunction as CSForbiddenAnd
-from ConfigSpace import ForbiddenEqualsClause as CSForbiddenEqual
-from ConfigSpace import ForbiddenInClause as CSForbiddenIn
-
 
 def skconfig_obj_to_config_space(skconfig_obj, cs):
+    # ConfigSpace is only imported when a configuration space is built
+    import ConfigSpace as CS
+
     if isinstance(skconfig_obj, EqualsCondition):
-        child_hp = cs.get_hyperparameter(skconfig_obj.child)
-        parent_hp = cs.get_hyperparameter(skconfig_obj.parent)
-        return CSEqualsCondition(child_hp, parent_hp,
-                                 skconfig_obj.conditioned_value)
+        child_hp = cs[skconfig_obj.child]
+        parent_hp = cs[skconfig_obj.parent]
+        return CS.EqualsCondition(child_hp, parent_hp,
+                                  skconfig_obj.conditioned_value)
     elif isinstance(skconfig_obj, NotEqualsCondition):
-        child_hp = cs.get_hyperparameter(skconfig_obj.child)
-        parent_hp = cs.get_hyperparameter(skconfig_obj.parent)
-        return CSNotEqualsCondition(child_hp, parent_hp,
-                                    skconfig_obj.conditioned_value)
+        child_hp = cs[skconfig_obj.child]
+        parent_hp = cs[skconfig_obj.parent]
+        return CS.NotEqualsCondition(child_hp, parent_hp,
+                                     skconfig_obj.conditioned_value)
     elif isinstance(skconfig_obj, LessThanCondition):
-        child_hp = cs.get_hyperparameter(skconfig_obj.child)
-        parent_hp = cs.get_hyperparameter(skconfig_obj.parent)
-        return CSLessThanCondition(child_hp, parent_hp,
-                                   skconfig_obj.conditioned_value)
+        child_hp = cs[skconfig_obj.child]
+        parent_hp = cs[skconfig_obj.parent]
+        return CS.LessThanCondition(child_hp, parent_hp,
+                                    skconfig_obj.conditioned_value)
     elif isinstance(skconfig_obj, GreaterThanCondition):
-        child_hp = cs.get_hyperparameter(skconfig_obj.child)
-        parent_hp = cs.get_hyperparameter(skconfig_obj.parent)
-        return CSGreaterThanCondition(child_hp, parent_hp,
-                                      skconfig_obj.conditioned_value)
+        child_hp = cs[skconfig_obj.child]
+        parent_hp = cs[skconfig_obj.parent]
+        return CS.GreaterThanCondition(child_hp, parent_hp,
+                                       skconfig_obj.conditioned_value)
     elif isinstance(skconfig_obj, InCondition):
-        child_hp = cs.get_hyperparameter(skconfig_obj.child)
-        parent_hp = cs.get_hyperparameter(skconfig_obj.parent)
-        return CSInCondition(child_hp, parent_hp,
-                             skconfig_obj.conditioned_value)
+        child_hp = cs[skconfig_obj.child]
+        parent_hp = cs[skconfig_obj.parent]
+        return CS.InCondition(child_hp, parent_hp,
+                              skconfig_obj.conditioned_value)
     elif isinstance(skconfig_obj, AndCondition):
         output = []
         for cond in skconfig_obj.conditons:
             output.append(skconfig_obj_to_config_space(cond, cs))
-        return CSAndCondition(*output)
+        return CS.AndConjunction(*output)
     elif isinstance(skconfig_obj, OrCondition):
         output = []
         for cond in skconfig_obj.conditons:
             output.append(skconfig_obj_to_config_space(cond, cs))
-        return CSOrCondition(*output)
+        return CS.OrConjunction(*output)
     elif isinstance(skconfig_obj, ForbiddenEquals):
-        hp = cs.get_hyperparameter(skconfig_obj.name)
-        return CSForbiddenEqual(hp, skconfig_obj.value)
+        hp = cs[skconfig_obj.name]
+        return CS.ForbiddenEqualsClause(hp, skconfig_obj.value)
     elif isinstance(skconfig_obj, ForbiddenIn):
-        hp = cs.get_hyperparameter(skconfig_obj.name)
-        return CSForbiddenIn(hp, skconfig_obj.value)
+        hp = cs[skconfig_obj.name]
+        return CS.ForbiddenInClause(hp, skconfig_obj.value)
     elif isinstance(skconfig_obj, ForbiddenAnd):
         output = []
         for forb in skconfig_obj.forbidden_clauses:
             output.append(skconfig_obj_to_config_space(forb, cs))
-        return CSForbiddenAnd(*output)
+        return CS.ForbiddenAndConjunction(*output)
     raise TypeError("Unable to recognize type: {}".format(skconfig_obj))
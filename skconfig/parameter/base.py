@@ -1,7 +1,45 @@
-from abc import ABCMeta, abstractmethod
+from abc import ABCMeta
+
+from ..exceptions import SKConfigValueError
+from ..exceptions import Violation
 
 
 class Param(metaclass=ABCMeta):
-    @abstractmethod
-    def validate(self, param):
-        ...
+    """Base class of parameter types.
+
+    Subclasses implement either ``validate``, which raises, or ``checker``,
+    which returns ``None`` or a ``Violation``.
+    """
+
+    def __new__(cls, *args, **kwargs):
+        # validate and checker are implemented in terms of each other
+        if cls.validate is Param.validate and cls.checker is Param.checker:
+            raise TypeError(
+                "Can't instantiate {} without validate or checker".format(
+                    cls.__name__))
+        return super().__new__(cls)
+
+    def validate(self, name, value):
+        violation = self.checker(name)(value)
+        if violation is not None:
+            raise violation.exception()
+
+    def checker(self, name):
+        """Return a callable checking a single value for ``name``.
+
+        The callable returns ``None`` for a valid value and a ``Violation``
+        otherwise.
+        """
+        validate = self.validate
+
+        def check(value):
+            try:
+                validate(name, value)
+            except SKConfigValueError as exc:
+                return Violation.from_exception(exc)
+
+        return check
+
+    def column_mask(self, column):
+        """Return a boolean mask of the valid rows of a ``Column``."""
+        return column.map_valid(self.checker(''))
@@ -1,4 +1,3 @@
-from numpy.random import RandomState
 from .types import NoneParam
 from .types import ObjectParam
 from .types import IntParam
@@ -6,4 +5,6 @@ from .types import UnionParam
 
 
 def RandomStateParam():
+    from numpy.random import RandomState
+
     return UnionParam(NoneParam(), IntParam(), ObjectParam(RandomState))
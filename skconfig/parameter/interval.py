@@ -1,6 +1,9 @@
+from operator import ge, gt, le, lt
+
 from .base import Param
 from ..exceptions import InvalidParamRange
 from ..exceptions import InvalidParamType
+from ..exceptions import Violation
 
 
 class NumericalInterval(Param):
@@ -14,37 +17,35 @@ class NumericalInterval(Param):
         self.include_lower = include_lower
         self.include_upper = include_upper
 
-    def validate(self, name, value):
-        if not isinstance(value, self.value_type):
-            raise InvalidParamType(name, self.type_str)
-
+    def checker(self, name):
+        value_type, type_str = self.value_type, self.type_str
+        lower, upper = self.lower, self.upper
+        lower_op = le if self.include_lower else lt
+        upper_op = le if self.include_upper else lt
+        include_lower, include_upper = self.include_lower, self.include_upper
+
+        def check(value):
+            if not isinstance(value, value_type):
+                return Violation(InvalidParamType, name, type_str)
+            if ((lower is not None and not lower_op(lower, value))
+                    or (upper is not None and not upper_op(value, upper))):
+                return Violation(InvalidParamRange, name, value, lower,
+                                 upper, include_lower, include_upper)
+
+        return check
+
+    def column_mask(self, column):
+        mask = column.type_mask(self.value_type)
+        in_range = mask[mask]
+        values = column.take(mask)
         if self.lower is not None:
-            if self.include_lower:
-                lower_in_range = self.lower <= value
-            else:
-                lower_in_range = self.lower < value
-            if not lower_in_range:
-                raise InvalidParamRange(
-                    name,
-                    value,
-                    lower=self.lower,
-                    upper=self.upper,
-                    include_lower=self.include_lower,
-                    include_upper=self.include_upper)
-
+            lower_op = ge if self.include_lower else gt
+            in_range &= values.compare(lower_op, self.lower)
         if self.upper is not None:
-            if self.include_upper:
-                upper_in_range = value <= self.upper
-            else:
-                upper_in_range = value < self.upper
-            if not upper_in_range:
-                raise InvalidParamRange(
-                    name,
-                    value,
-                    lower=self.lower,
-                    upper=self.upper,
-                    include_lower=self.include_lower,
-                    include_upper=self.include_upper)
+            upper_op = le if self.include_upper else lt
+            in_range &= values.compare(upper_op, self.upper)
+        mask[mask] = in_range
+        return mask
 
 
 class FloatIntervalParam(NumericalInterval):
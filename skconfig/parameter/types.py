@@ -4,12 +4,21 @@ from .base import Param
 from ..exceptions import InvalidParamType
 from ..exceptions import InvalidParamChoices
 from ..exceptions import SKConfigValueError
+from ..exceptions import Violation
 
 
 class TypedParam(Param):
-    def validate(self, name, value):
-        if not isinstance(value, self.value_type):
-            raise InvalidParamType(name, self.type_str)
+    def checker(self, name):
+        value_type, type_str = self.value_type, self.type_str
+
+        def check(value):
+            if not isinstance(value, value_type):
+                return Violation(InvalidParamType, name, type_str)
+
+        return check
+
+    def column_mask(self, column):
+        return column.type_mask(self.value_type)
 
 
 class BoolParam(TypedParam):
@@ -44,11 +53,22 @@ class StringParam(Param):
                 raise SKConfigValueError("choices must be all strings")
         self.choices = choices
 
-    def validate(self, name, value):
-        if not isinstance(value, self.value_type):
-            raise InvalidParamType(name, self.type_str)
-        if value not in self.choices:
-            raise InvalidParamChoices(name, self.choices)
+    def checker(self, name):
+        value_type, type_str = self.value_type, self.type_str
+        choices, choice_set = self.choices, frozenset(self.choices)
+
+        def check(value):
+            if not isinstance(value, value_type):
+                return Violation(InvalidParamType, name, type_str)
+            if value not in choice_set:
+                return Violation(InvalidParamChoices, name, choices)
+
+        return check
+
+    def column_mask(self, column):
+        mask = column.type_mask(self.value_type)
+        mask[mask] = column.take(mask).isin(self.choices)
+        return mask
 
 
 class CallableParam(TypedParam):
@@ -63,9 +83,17 @@ class ObjectParam(Param):
     def __init__(self, *objects):
         self.objects = objects
 
-    def validate(self, name, value):
-        if not isinstance(value, self.objects):
-            raise InvalidParamType(name, self.type_str)
+    def checker(self, name):
+        objects, type_str = self.objects, self.type_str
+
+        def check(value):
+            if not isinstance(value, objects):
+                return Violation(InvalidParamType, name, type_str)
+
+        return check
+
+    def column_mask(self, column):
+        return column.type_mask(self.objects)
 
 
 class UnionParam(Param):
@@ -77,11 +105,25 @@ class UnionParam(Param):
                 raise SKConfigValueError("parameters must be all Param")
         self.parameters = parameters
 
-    def validate(self, name, value):
+    def checker(self, name):
+        branches = tuple((param.value_type, param.checker(name))
+                         for param in self.parameters)
+        p_types = [param.type_str for param in self.parameters]
+
+        def check(value):
+            for value_type, branch_check in branches:
+                if isinstance(value, value_type):
+                    return branch_check(value)
+            return Violation(InvalidParamType, name, p_types)
+
+        return check
+
+    def column_mask(self, column):
+        valid = column.full(False)
+        remaining = column.full(True)
         for param in self.parameters:
-            if isinstance(value, param.value_type):
-                param.validate(name, value)
-                break
-        else:
-            p_types = [param.type_str for param in self.parameters]
-            raise InvalidParamType(name, p_types)
+            branch = remaining & column.type_mask(param.value_type)
+            if branch.any():
+                valid[branch] = param.column_mask(column.take(branch))
+            remaining &= ~branch
+        return valid
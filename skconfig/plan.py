@@ -0,0 +1,108 @@
+from .parameter.base import Param
+from .exceptions import SKConfigValueError
+from .compiler import CompiledForbiddens
+from .compiler import compile_condition
+
+
+def _collect_parameters(validator_cls):
+    parameters = {}
+    for klass in reversed(validator_cls.__mro__):
+        for name, value in vars(klass).items():
+            if isinstance(value, Param):
+                parameters[name] = value
+            elif name in parameters:
+                # A subclass shadowed the inherited Param with a non Param
+                del parameters[name]
+    return parameters
+
+
+def _collect_steps(validator_cls):
+    # Params, forbiddens and conditions of the step validators of a
+    # CompositeValidator, with the step__ prefix of get_params(deep=True)
+    parameters, forbiddens, conditions = {}, [], []
+    for step, step_validator in getattr(validator_cls, 'validators',
+                                        {}).items():
+        prefix = "{}__".format(step)
+        step_plan = step_validator._plan
+        for name, param in step_plan.parameters.items():
+            parameters[prefix + name] = param
+        forbiddens.extend(
+            forbidden.prefixed(prefix) for forbidden in step_plan.forbiddens)
+        conditions.extend(
+            cond.prefixed(prefix) for _, cond, _, _ in step_plan.conditions)
+    return parameters, forbiddens, conditions
+
+
+class ValidationPlan:
+    """Flattened form of a validator class used by ``validate_params``.
+
+    Built once when the validator class is created. Holds the Params found
+    along the MRO, a per-name checker callable, the conditioned names, the
+    conditions and forbiddens as tuples, and an index from parameter names
+    to the forbiddens and conditions that depend on them. Forbiddens are
+    also compiled into lookup tables and every condition into a predicate.
+
+    The plans of the ``validators`` of a ``CompositeValidator`` are merged
+    in under prefixed names. ``validator`` is a validator class, or an
+    instance overriding the clauses of its class.
+    """
+
+    def __init__(self, validator):
+        validator_cls = (validator
+                         if isinstance(validator, type) else type(validator))
+        step_parameters, step_forbiddens, step_conditions = _collect_steps(
+            validator)
+        self.parameters = _collect_parameters(validator_cls)
+        self.parameters.update(step_parameters)
+        self.checkers = {
+            name: param.checker(name)
+            for name, param in self.parameters.items()
+        }
+        self.forbiddens = tuple(validator.forbiddens) + tuple(
+            step_forbiddens)
+        self.compiled_forbiddens = CompiledForbiddens(self.forbiddens)
+
+        all_conditions = list(validator.conditions) + step_conditions
+        conditions = []
+        shared = {}
+        for cond in all_conditions:
+            if cond.child not in self.checkers:
+                raise SKConfigValueError(
+                    "{} is conditioned but is not a parameter".format(
+                        cond.child))
+            conditions.append((cond.child, cond, self.checkers[cond.child],
+                               compile_condition(cond, shared)))
+        self.conditions = tuple(conditions)
+        self.conditioned = frozenset(cond.child for cond in all_conditions)
+
+        # Maps a parameter name to the indices of the forbiddens and
+        # conditions that mention it
+        dependents = {}
+        for i, forbidden in enumerate(self.forbiddens):
+            for name in forbidden.names:
+                dependents.setdefault(name, ([], []))[0].append(i)
+        for i, (_, condition, _, _) in enumerate(self.conditions):
+            for name in condition.names:
+                dependents.setdefault(name, ([], []))[1].append(i)
+        self.dependents = {
+            name: (tuple(forbidden_ids), tuple(condition_ids))
+            for name, (forbidden_ids, condition_ids) in dependents.items()
+        }
+
+    def reachable(self, names):
+        """Forbiddens and conditions that depend on any of ``names``, in
+        declaration order."""
+        if len(names) == 1:
+            name, = names
+            forbidden_ids, condition_ids = self.dependents.get(
+                name, ((), ()))
+        else:
+            forbidden_ids, condition_ids = set(), set()
+            for name in names:
+                if name in self.dependents:
+                    forbidden_ids.update(self.dependents[name][0])
+                    condition_ids.update(self.dependents[name][1])
+            forbidden_ids = sorted(forbidden_ids)
+            condition_ids = sorted(condition_ids)
+        return ([self.forbiddens[i] for i in forbidden_ids],
+                [self.conditions[i] for i in condition_ids])
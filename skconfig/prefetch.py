@@ -0,0 +1,124 @@
+import asyncio
+import threading
+
+from .exceptions import SKConfigValueError
+
+# Put on the queue by the worker when it stops
+_DONE = object()
+
+
+class AsyncSampler:
+    """Draws configurations from ``sampler`` in a background thread for
+    asyncio code.
+
+    Create it inside a running event loop. The thread samples
+    ``batch_size`` configurations at a time and hands them to the loop with
+    ``call_soon_threadsafe``, keeping at most ``maxsize`` of them queued and
+    blocking while that many are waiting. When ``validate`` is True,
+    configurations rejected by ``check_params`` of the validator are
+    dropped. ``await next()`` waits on an ``asyncio.Queue``, a cancelled
+    call leaves the queued configurations in place. Iterate with
+    ``async for``, and call ``aclose`` or use ``async with`` to stop the
+    thread. ``sampler`` must not be used elsewhere until then.
+    """
+
+    def __init__(self, sampler, maxsize=1000, batch_size=100, validate=True):
+        if maxsize < 1:
+            raise SKConfigValueError("maxsize must be at least 1")
+        if batch_size < 1:
+            raise SKConfigValueError("batch_size must be at least 1")
+        self.sampler = sampler
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.validate = validate
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        # Free places in the queue, taken by the worker and given back by
+        # next, so the worker waits without involving the loop
+        self._slots = threading.Semaphore(maxsize)
+        self._stopped = self._loop.create_future()
+        self._stop = threading.Event()
+        self._error = None
+        self._done = False
+        self._thread = threading.Thread(target=self._fill, daemon=True)
+        self._thread.start()
+
+    def _call(self, callback, *args):
+        try:
+            self._loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # The loop is closed, nobody is waiting anymore
+            pass
+
+    def _fill(self):
+        check = self.sampler.validator.check_params
+        try:
+            while not self._stop.is_set():
+                for config in self.sampler.sample(self.batch_size):
+                    if self.validate and not check(config):
+                        continue
+                    self._slots.acquire()
+                    if self._stop.is_set():
+                        return
+                    self._call(self._queue.put_nowait, config)
+        except Exception as exc:
+            self._error = exc
+        finally:
+            self._call(self._queue.put_nowait, _DONE)
+            self._call(self._set_stopped)
+
+    def _set_stopped(self):
+        if not self._stopped.done():
+            self._stopped.set_result(None)
+
+    def qsize(self):
+        """Number of configurations ready to be popped."""
+        return self._queue.qsize()
+
+    async def next(self):
+        """Next configuration, raises ``StopAsyncIteration`` once closed.
+        An error of the worker is raised by one call, the next ones stop."""
+        if self._done:
+            raise StopAsyncIteration
+        config = await self._queue.get()
+        if config is _DONE:
+            self._done = True
+            # Wake up the other pending calls too
+            self._queue.put_nowait(_DONE)
+            error, self._error = self._error, None
+            if error is not None:
+                raise error
+            raise StopAsyncIteration
+        self._slots.release()
+        return config
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.next()
+
+    def _request_stop(self):
+        self._stop.set()
+        self._done = True
+        # Unblock a worker waiting for a free place
+        self._slots.release()
+
+    def close(self):
+        """Stop the thread and drop the queued configurations, blocks until
+        the current batch is sampled."""
+        self._request_stop()
+        self._thread.join()
+        self._queue.put_nowait(_DONE)
+
+    async def aclose(self):
+        """Like ``close`` without blocking the loop."""
+        self._request_stop()
+        await self._stopped
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
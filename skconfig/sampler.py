@@ -1,6 +1,11 @@
+import json
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import suppress
+from threading import Lock
+from operator import index as as_index
 
-import ConfigSpace as CS
+import numpy as np
 from .distribution import load_dist_dict
 from .exceptions import SKConfigValueError
 from .distribution import BaseDistribution
@@ -14,10 +19,91 @@ from .forbidden import ForbiddenEquals
 from .forbidden import ForbiddenIn
 
 from .mapping import skconfig_obj_to_config_space
+from .compiler import forbidden_from_atoms
+from .compiler import lower_forbidden
+from .cache import LRUCache
+from .engine import ConfigSpaceEngine
+from .engine import LatinHypercubeEngine
+from .engine import NumpyEngine
+from .engine import SobolEngine
+from .samples import SampleBatch
+from .unique import UniqueFilter
+
+ENGINES = {
+    'configspace': ConfigSpaceEngine,
+    'numpy': NumpyEngine,
+    'sobol': SobolEngine,
+    'lhs': LatinHypercubeEngine,
+}
+
+
+CompiledSpace = namedtuple('CompiledSpace', [
+    'active_params', 'active_conditions', 'active_forbiddens', 'config_space',
+    'normalized_conditions', 'normalized_forbiddens', 'cs_conditions',
+    'cs_forbiddens', 'config_space_lock'
+])
+
+_space_cache = LRUCache(maxsize=128)
+
+
+def _space_key(validator, hps, engine):
+    # The plan is replaced when the conditions or forbiddens of the
+    # validator class change
+    try:
+        dists = json.dumps([[name, dist.to_dict()]
+                            for name, dist in hps.items()],
+                           sort_keys=True)
+    except TypeError:
+        return None
+    return type(validator), validator._plan, dists, engine
+
+
+def space_cache_info():
+    """Hits, misses and size of the cache of compiled ConfigSpaces shared
+    by every Sampler."""
+    return _space_cache.info()
+
+
+def clear_space_cache():
+    _space_cache.clear()
+
+
+def _sample_chunk(validator, engine, engine_options, dist_dict, seed, size):
+    sampler = Sampler(validator, engine=engine, seed=seed,
+                      engine_options=engine_options)
+    return sampler.from_dict(dist_dict).sample(size)
 
 
 class Sampler:
-    def __init__(self, validator, **kwargs):
+    """Samples parameters of a validator from distributions.
+
+    ``engine`` selects how samples are drawn: ``'configspace'`` samples
+    from a ConfigSpace ``ConfigurationSpace``, ``'numpy'`` draws whole
+    columns with ``BaseDistribution.sample_column``, ``'sobol'`` and
+    ``'lhs'`` map a scrambled Sobol sequence or a Latin hypercube from
+    ``scipy.stats.qmc`` with ``BaseDistribution.from_unit``.
+
+    ``seed`` is an int, a ``numpy.random.SeedSequence`` or None, samples
+    drawn from samplers with the same seed and distributions are the same.
+
+    ``engine_options`` are passed to the engine, e.g. ``feasible_weights``
+    and ``max_feasible_size`` of the ``'numpy'`` engine or ``scramble`` of
+    the ``'sobol'`` and ``'lhs'`` engines.
+    """
+
+    def __init__(self, validator, engine='configspace', seed=None,
+                 engine_options=None, **kwargs):
+        if engine not in ENGINES:
+            raise SKConfigValueError("engine must be one of {}".format(
+                sorted(ENGINES)))
+        self.engine = engine
+        self.engine_options = dict(engine_options or {})
+        self.seed = seed
+        if isinstance(seed, np.random.SeedSequence):
+            self._seed_sequence = seed
+        else:
+            self._seed_sequence = np.random.SeedSequence(seed)
+        self._rng = np.random.default_rng(self._seed_sequence)
         self.hps = {}
         for k, v in kwargs.items():
             if k in validator.parameters_:
@@ -50,7 +136,23 @@ class Sampler:
         return "\n".join(lines)
 
     def _generate_config_space(self):
-        active_params = set(self.hps)
+        key = _space_key(self.validator, self.hps, self.engine)
+        space = None if key is None else _space_cache.get(key)
+        if space is None:
+            space = self._compile_space()
+            if key is not None:
+                _space_cache.put(key, space)
+        for field, value in zip(CompiledSpace._fields, space):
+            setattr(self, field, value)
+
+        # The ConfigurationSpace may be shared with other samplers, so the
+        # sampler keeps its own random state
+        self._cs_random = np.random.RandomState(int(self._rng.integers(2**31)))
+        self._engine = ENGINES[self.engine](self, **self.engine_options)
+
+    def _compile_space(self):
+        # A list keeps the order of the hyperparameters deterministic
+        active_params = list(self.hps)
         active_conditions = []
         active_forbiddens = []
 
@@ -61,7 +163,7 @@ class Sampler:
 
             active_cond = self._get_active_condition(cond)
             if active_cond is None:
-                with suppress(KeyError):
+                with suppress(ValueError):
                     active_params.remove(cond.child)
                 continue
             active_conditions.append(active_cond)
@@ -73,44 +175,157 @@ class Sampler:
                 continue
             active_forbiddens.append(active_forb)
 
+        normalized_conditions = tuple(
+            self._normalize_condition_names(cond)
+            for cond in active_conditions)
+        normalized_forbiddens = tuple(
+            self._normalize_forbidden_names(forb)
+            for forb in active_forbiddens)
+        if self.engine != 'configspace':
+            # The other engines only need the active clauses
+            return CompiledSpace(
+                tuple(active_params), tuple(active_conditions),
+                tuple(active_forbiddens), None, normalized_conditions,
+                normalized_forbiddens, (), (), None)
+
+        import ConfigSpace as CS
+
         # Create configuration space
         config_space = CS.ConfigurationSpace()
-        self.config_space = config_space
-
         for name in active_params:
             self.hps[name].add_to_config_space(name, config_space)
 
-        self.normalized_conditions = [
-            self._normalize_condition_names(cond) for cond in active_conditions
-        ]
-
-        self.normalized_forbiddens = [
-            self._normalize_forbidden_names(forb) for forb in active_forbiddens
-        ]
-
-        self.cs_conditions = [
+        cs_conditions = tuple(
             skconfig_obj_to_config_space(cond, config_space)
-            for cond in self.normalized_conditions
-        ]
-        self.cs_forbiddens = [
+            for cond in normalized_conditions)
+        cs_forbiddens = tuple(
             skconfig_obj_to_config_space(forb, config_space)
-            for forb in self.normalized_forbiddens
-        ]
-        config_space.add_conditions(self.cs_conditions)
-        config_space.add_forbidden_clauses(self.cs_forbiddens)
-
-    def sample(self, size=1):
-        configs = self.config_space.sample_configuration(size)
-        if size == 1:
-            configs = [configs]
+            for forb in normalized_forbiddens)
+        config_space.add(*cs_conditions, *cs_forbiddens)
+
+        return CompiledSpace(
+            tuple(active_params), tuple(active_conditions),
+            tuple(active_forbiddens), config_space, normalized_conditions,
+            normalized_forbiddens, cs_conditions, cs_forbiddens, Lock())
+
+    def sample(self, size=1, as_batch=False, unique=False):
+        """Sample ``size`` configurations, as a list of dicts or as a
+        columnar ``SampleBatch`` when ``as_batch`` is True.
+
+        With ``unique`` set to True or to a ``UniqueFilter``, repeated
+        configurations are skipped. Fewer than ``size`` configurations are
+        returned when the filter gives up on finding new ones. A filter
+        that is passed in also skips the configurations of earlier calls.
+        """
+        if unique is not False:
+            if unique is True:
+                unique = UniqueFilter()
+            batch = self._sample_unique(size, unique)
+            return batch if as_batch else batch.to_records()
+        if as_batch:
+            return self._engine.sample_batch(size)
+        return self._engine.sample(size)
+
+    def _sample_unique(self, size, unique):
+        batches = []
+        n_sampled = 0
+        n_stale = 0
+        while n_sampled < size and n_stale < unique.patience:
+            remaining = size - n_sampled
+            # Small rounds rarely find the last few new configurations
+            batch = self._engine.sample_batch(max(remaining, 100))
+            keep = np.zeros(len(batch), dtype=bool)
+            n_new = 0
+            for i, config in enumerate(batch):
+                if n_new == remaining:
+                    break
+                if unique.add(config):
+                    keep[i] = True
+                    n_new += 1
+            n_stale = 0 if n_new else n_stale + 1
+            batches.append(batch.take(keep))
+            n_sampled += n_new
+        return SampleBatch.concatenate(batches)
+
+    def sample_parallel(self, size, n_jobs=None, chunk_size=1000):
+        """Sample in ``n_jobs`` processes.
+
+        The samples are drawn in chunks of ``chunk_size``, each with its
+        own seed spawned from the seed of the sampler, so the output only
+        depends on the seed and not on ``n_jobs``.
+        """
+        if chunk_size < 1:
+            raise SKConfigValueError("chunk_size must be at least 1")
+        sizes = [chunk_size] * (size // chunk_size)
+        if size % chunk_size:
+            sizes.append(size % chunk_size)
+        seeds = self._seed_sequence.spawn(len(sizes))
+        dist_dict = self.to_dict()
+        args = ([self.validator] * len(sizes), [self.engine] * len(sizes),
+                [self.engine_options] * len(sizes), [dist_dict] * len(sizes),
+                seeds, sizes)
+
+        if n_jobs == 1:
+            chunks = map(_sample_chunk, *args)
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                chunks = list(executor.map(_sample_chunk, *args))
         output = []
-        for config in configs:
-            config_dict = config.get_dictionary()
-            for name, dist in self.hps.items():
-                dist.post_process(name, config_dict)
-            output.append(config_dict)
+        for chunk in chunks:
+            output.extend(chunk)
         return output
 
+    def sample_at(self, indices):
+        """Sample number ``index`` of the seeded stream for each of
+        ``indices``.
+
+        Any sample is drawn directly without drawing the ones before it, and
+        samplers with the same seed and distributions return the same
+        samples. This always uses the ``'numpy'`` engine.
+        """
+        indices = [as_index(index) for index in indices]
+        if any(index < 0 or index >= 2**64 for index in indices):
+            raise SKConfigValueError("indices must be in [0, 2**64)")
+        if type(self._engine) is NumpyEngine:
+            engine = self._engine
+        else:
+            engine = NumpyEngine(self)
+        key = self._seed_sequence.generate_state(2, dtype=np.uint64)
+        return engine.sample_at(indices, key)
+
+    def iter_samples(self, batch_size=100, n_samples=None, batches=False,
+                     unique=False):
+        """Generate samples one batch at a time.
+
+        Yields single configurations, or lists of ``batch_size``
+        configurations when ``batches`` is True. Stops after ``n_samples``
+        configurations, or never when it is None. Only the current batch is
+        kept in memory.
+
+        ``unique`` skips repeats across the whole stream like in ``sample``,
+        and the stream stops once no new configuration is found. Pass a
+        ``UniqueFilter`` with ``seen='lru'`` or ``'bloom'`` to bound its
+        memory on long streams.
+        """
+        if batch_size < 1:
+            raise SKConfigValueError("batch_size must be at least 1")
+        if unique is True:
+            unique = UniqueFilter()
+        n_generated = 0
+        while n_samples is None or n_generated < n_samples:
+            size = batch_size
+            if n_samples is not None:
+                size = min(size, n_samples - n_generated)
+            batch = self.sample(size, unique=unique)
+            n_generated += len(batch)
+            if batch:
+                if batches:
+                    yield batch
+                else:
+                    yield from batch
+            if len(batch) < size:
+                return
+
     def _get_active_condition(self, cond):
         if isinstance(cond, OrCondition):
             output = []
@@ -139,42 +354,23 @@ class Sampler:
             return cond
 
     def _get_active_forbidden(self, forbidden, active_params):
-        if isinstance(forbidden, ForbiddenAnd):
-            values = []
-            for forb in forbidden.forbidden_clauses:
-                name = forb.name
-                if name not in active_params:
-                    return
-                dist = self.hps[name]
-                active_forb = self._get_active_forbidden(forb, active_params)
-                if active_forb is None:
-                    return
-                values.append(active_forb)
-            return ForbiddenAnd(values)
-        elif isinstance(forbidden, ForbiddenIn):
-            name = forbidden.name
+        atoms = lower_forbidden(forbidden)
+        if atoms is None:
+            raise TypeError("Unrecognized type {}".format(forbidden))
+
+        active_atoms = []
+        for name, values in atoms:
             if name not in active_params:
                 return
-
-            values = []
             dist = self.hps[name]
-            for value in forbidden.value:
-                if (dist.in_distrubution(value) and not dist.is_constant()):
-                    values.append(value)
-            if not values:
+            if dist.is_constant():
                 return
-            return ForbiddenIn(name, values)
-        elif isinstance(forbidden, ForbiddenEquals):
-            name = forbidden.name
-            if name not in active_params:
+            values = tuple(value for value in values
+                           if dist.in_distrubution(value))
+            if not values:
                 return
-
-            dist = self.hps[name]
-            if (dist.in_distrubution(forbidden.value)
-                    and not dist.is_constant()):
-                return forbidden
-            return
-        raise TypeError("Unrecognized type {}".format(forbidden))
+            active_atoms.append((name, values))
+        return forbidden_from_atoms(active_atoms)
 
     def _normalize_condition_names(self, condition):
         if isinstance(condition, (AndCondition, OrCondition)):
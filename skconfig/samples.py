@@ -0,0 +1,285 @@
+from operator import index as as_index
+
+import numpy as np
+
+from .exceptions import SKConfigValueError
+
+
+def _to_python(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _code_dtype(n_categories):
+    return np.min_scalar_type(max(n_categories - 1, 0))
+
+
+class ArrayColumn:
+    """Sampled values stored as they are, e.g. ints or floats."""
+
+    def __init__(self, values):
+        self.values = values
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes
+
+    def decode(self, n):
+        return self.values
+
+    def value(self, index):
+        return _to_python(self.values[index])
+
+    def take(self, key):
+        return ArrayColumn(self.values[key])
+
+    def scatter(self, mask):
+        values = np.zeros(len(mask), dtype=self.values.dtype)
+        values[mask] = self.values
+        return ArrayColumn(values)
+
+    @classmethod
+    def concatenate(cls, columns):
+        return cls(np.concatenate([column.values for column in columns]))
+
+
+class CodedColumn:
+    """Sampled values stored as small integer codes into ``categories``."""
+
+    def __init__(self, codes, categories):
+        self.codes = codes
+        self.categories = tuple(categories)
+
+    @classmethod
+    def from_codes(cls, codes, categories):
+        return cls(codes.astype(_code_dtype(len(categories))), categories)
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes
+
+    def _table(self):
+        categories = self.categories
+        if all(type(category) is bool for category in categories):
+            return np.array(categories, dtype=bool)
+        if all(isinstance(category, str) for category in categories):
+            return np.array(categories)
+        table = np.empty(len(categories), dtype=object)
+        for i, category in enumerate(categories):
+            table[i] = category
+        return table
+
+    def decode(self, n):
+        return self._table()[self.codes]
+
+    def value(self, index):
+        return self.categories[self.codes[index]]
+
+    def take(self, key):
+        return CodedColumn(self.codes[key], self.categories)
+
+    def scatter(self, mask):
+        codes = np.zeros(len(mask), dtype=self.codes.dtype)
+        codes[mask] = self.codes
+        return CodedColumn(codes, self.categories)
+
+    @classmethod
+    def concatenate(cls, columns):
+        return cls(np.concatenate([column.codes for column in columns]),
+                   columns[0].categories)
+
+
+class ConstantColumn:
+    """The same value in every row, no array is stored."""
+    nbytes = 0
+
+    def __init__(self, value):
+        self.value_ = value
+
+    def decode(self, n):
+        values = np.empty(n, dtype=object)
+        values.fill(self.value_)
+        return values
+
+    def value(self, index):
+        return self.value_
+
+    def take(self, key):
+        return self
+
+    def scatter(self, mask):
+        return self
+
+    @classmethod
+    def concatenate(cls, columns):
+        return columns[0]
+
+
+class UnionColumn:
+    """Values of a union: ``branches`` holds the index of the branch of
+    every row and ``columns`` one column per branch, only meaningful in the
+    rows of that branch."""
+
+    def __init__(self, branches, columns):
+        self.branches = branches
+        self.columns = list(columns)
+
+    @property
+    def nbytes(self):
+        return self.branches.nbytes + sum(
+            column.nbytes for column in self.columns)
+
+    def decode(self, n):
+        values = np.empty(n, dtype=object)
+        for branch, column in enumerate(self.columns):
+            mask = self.branches == branch
+            if mask.any():
+                values[mask] = column.decode(n)[mask]
+        return values
+
+    def value(self, index):
+        return self.columns[self.branches[index]].value(index)
+
+    def take(self, key):
+        return UnionColumn(self.branches[key],
+                           [column.take(key) for column in self.columns])
+
+    def scatter(self, mask):
+        branches = np.zeros(len(mask), dtype=self.branches.dtype)
+        branches[mask] = self.branches
+        return UnionColumn(branches,
+                           [column.scatter(mask) for column in self.columns])
+
+    @classmethod
+    def concatenate(cls, columns):
+        branches = np.concatenate([column.branches for column in columns])
+        return cls(branches, [
+            concatenate_columns([column.columns[i] for column in columns])
+            for i in range(len(columns[0].columns))
+        ])
+
+
+def concatenate_columns(columns):
+    return type(columns[0]).concatenate(columns)
+
+
+class SampleBatch:
+    """Columnar batch of sampled configurations.
+
+    ``columns`` maps every parameter name to an encoded column and
+    ``active`` maps conditioned parameters to a mask of the rows where they
+    are active. Rows are only turned into dicts when asked for, with
+    ``batch[i]``, iteration or ``to_records``. Slicing with ``batch[a:b]``
+    returns a batch of views on the same arrays.
+    """
+
+    def __init__(self, columns, active, n_rows):
+        self.columns = columns
+        self.active = active
+        self.n_rows = n_rows
+
+    @classmethod
+    def from_records(cls, records, hps):
+        """Encode dicts sampled from the distributions ``hps``."""
+        records = list(records)
+        n_rows = len(records)
+        columns = {}
+        active = {}
+        for name, dist in hps.items():
+            mask = np.fromiter((name in record for record in records),
+                               dtype=bool,
+                               count=n_rows)
+            values = [record[name] for record in records if name in record]
+            column = dist.encode(values)
+            if not mask.all():
+                column = column.scatter(mask)
+                active[name] = mask
+            columns[name] = column
+        return cls(columns, active, n_rows)
+
+    @classmethod
+    def concatenate(cls, batches):
+        batches = list(batches)
+        if not batches:
+            return cls({}, {}, 0)
+        columns = {
+            name: concatenate_columns(
+                [batch.columns[name] for batch in batches])
+            for name in batches[0].columns
+        }
+        active = {}
+        for name in set().union(*(batch.active for batch in batches)):
+            active[name] = np.concatenate([
+                batch.active.get(name, np.ones(len(batch), dtype=bool))
+                for batch in batches
+            ])
+        return cls(columns, active, sum(len(batch) for batch in batches))
+
+    @property
+    def names(self):
+        return list(self.columns)
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in self.columns.values()) + sum(
+            mask.nbytes for mask in self.active.values())
+
+    def __len__(self):
+        return self.n_rows
+
+    def __getitem__(self, key):
+        if isinstance(key, (slice, np.ndarray, list)):
+            return self.take(key)
+        index = as_index(key)
+        if index < 0:
+            index += self.n_rows
+        if not 0 <= index < self.n_rows:
+            raise IndexError("index {} is out of range".format(key))
+        return {
+            name: column.value(index)
+            for name, column in self.columns.items()
+            if name not in self.active or self.active[name][index]
+        }
+
+    def __iter__(self):
+        chunk_size = 1024
+        for start in range(0, self.n_rows, chunk_size):
+            for record in self[start:start + chunk_size].to_records():
+                yield record
+
+    def take(self, key):
+        """Rows selected by a slice, a mask or indices."""
+        if isinstance(key, slice):
+            n_rows = len(range(*key.indices(self.n_rows)))
+        else:
+            key = np.asarray(key)
+            if key.dtype == bool:
+                if len(key) != self.n_rows:
+                    raise SKConfigValueError(
+                        "mask must have one entry per row")
+                n_rows = int(np.count_nonzero(key))
+            else:
+                n_rows = len(key)
+        columns = {
+            name: column.take(key)
+            for name, column in self.columns.items()
+        }
+        active = {name: mask[key] for name, mask in self.active.items()}
+        return SampleBatch(columns, active, n_rows)
+
+    def column(self, name):
+        """Decoded values of ``name``, rows where it is not active hold
+        arbitrary values."""
+        return self.columns[name].decode(self.n_rows)
+
+    def to_records(self):
+        names = self.names
+        if not names:
+            return [{} for _ in range(self.n_rows)]
+        values = [self.column(name).tolist() for name in names]
+        records = [dict(zip(names, row)) for row in zip(*values)]
+        for name, mask in self.active.items():
+            for index in np.flatnonzero(~mask):
+                del records[index][name]
+        return records
@@ -0,0 +1,121 @@
+import json
+
+import numpy as np
+
+from .exceptions import SKConfigValueError
+from .samples import ArrayColumn
+from .samples import CodedColumn
+from .samples import ConstantColumn
+from .samples import SampleBatch
+from .samples import UnionColumn
+
+FORMAT_VERSION = 1
+
+
+def write_jsonl(samples, fp):
+    """Write samples, a ``SampleBatch`` or an iterable of dicts, to the text
+    file ``fp`` with one JSON object per line. Returns the number of lines
+    written."""
+    dumps = json.dumps
+    n_lines = 0
+    for sample in samples:
+        fp.write(dumps(sample))
+        fp.write("\n")
+        n_lines += 1
+    return n_lines
+
+
+def iter_jsonl(fp):
+    """Yield the samples of a file written by ``write_jsonl`` one at a
+    time."""
+    loads = json.loads
+    for line in fp:
+        if line.strip():
+            yield loads(line)
+
+
+def _column_spec(column, arrays):
+    def add_array(array):
+        if array.dtype.kind == 'O':
+            raise SKConfigValueError(
+                "object arrays can not be saved, encode the values with a "
+                "builtin distribution")
+        key = "a{}".format(len(arrays))
+        arrays[key] = array
+        return key
+
+    if isinstance(column, ArrayColumn):
+        return {'kind': 'array', 'values': add_array(column.values)}
+    if isinstance(column, CodedColumn):
+        return {
+            'kind': 'coded',
+            'codes': add_array(column.codes),
+            'categories': list(column.categories)
+        }
+    if isinstance(column, ConstantColumn):
+        return {'kind': 'constant', 'value': column.value_}
+    if isinstance(column, UnionColumn):
+        return {
+            'kind': 'union',
+            'branches': add_array(column.branches),
+            'columns': [_column_spec(col, arrays) for col in column.columns]
+        }
+    raise TypeError("Unrecognized column type {}".format(column))
+
+
+def _load_column(spec, arrays):
+    kind = spec['kind']
+    if kind == 'array':
+        return ArrayColumn(arrays[spec['values']])
+    if kind == 'coded':
+        return CodedColumn(arrays[spec['codes']], spec['categories'])
+    if kind == 'constant':
+        return ConstantColumn(spec['value'])
+    if kind == 'union':
+        return UnionColumn(
+            arrays[spec['branches']],
+            [_load_column(col, arrays) for col in spec['columns']])
+    raise SKConfigValueError("Unrecognized column kind {}".format(kind))
+
+
+def save_samples(file, batch, spec=None):
+    """Save a ``SampleBatch`` and optionally a sampler spec, as returned by
+    ``Sampler.to_dict``, into a ``.npz`` file.
+
+    The encoded arrays of the batch are stored as they are, with a JSON
+    header describing the columns.
+    """
+    arrays = {}
+    header = {
+        'version': FORMAT_VERSION,
+        'n_rows': len(batch),
+        'columns': {
+            name: _column_spec(column, arrays)
+            for name, column in batch.columns.items()
+        },
+        'active': {},
+        'spec': spec,
+    }
+    for name, mask in batch.active.items():
+        key = "a{}".format(len(arrays))
+        arrays[key] = mask
+        header['active'][name] = key
+    arrays['header'] = np.array(json.dumps(header))
+    np.savez(file, **arrays)
+
+
+def load_samples(file):
+    """Load a file written by ``save_samples``, returns the ``SampleBatch``
+    and the sampler spec."""
+    with np.load(file, allow_pickle=False) as data:
+        header = json.loads(str(data['header']))
+        if header['version'] != FORMAT_VERSION:
+            raise SKConfigValueError("Unsupported format version {}".format(
+                header['version']))
+        arrays = {key: data[key] for key in data.files if key != 'header'}
+    columns = {
+        name: _load_column(spec, arrays)
+        for name, spec in header['columns'].items()
+    }
+    active = {name: arrays[key] for name, key in header['active'].items()}
+    return SampleBatch(columns, active, header['n_rows']), header['spec']
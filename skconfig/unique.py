@@ -0,0 +1,148 @@
+import hashlib
+import math
+
+from .cache import LRUCache
+from .exceptions import SKConfigValueError
+
+
+def config_key(config, float_decimals=None):
+    """16 byte hash of a configuration dict, independent of the key order.
+
+    Floats are rounded to ``float_decimals`` decimals first when it is not
+    None, so close values share a key.
+    """
+    items = []
+    for name in sorted(config):
+        value = config[name]
+        if float_decimals is not None and isinstance(value, float):
+            # Adding 0.0 turns -0.0 into 0.0
+            value = round(value, float_decimals) + 0.0
+        items.append((name, value))
+    return hashlib.blake2b(repr(items).encode(), digest_size=16).digest()
+
+
+class ExactSeenSet:
+    """Keeps every key."""
+
+    def __init__(self):
+        self._keys = set()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def add(self, key):
+        """Add ``key``, returns False when it was already seen."""
+        if key in self._keys:
+            return False
+        self._keys.add(key)
+        return True
+
+
+class LRUSeenSet:
+    """Keeps the ``maxsize`` most recently seen keys, older repeats are
+    not detected."""
+
+    def __init__(self, maxsize):
+        self._cache = LRUCache(maxsize)
+
+    def __len__(self):
+        return len(self._cache)
+
+    def __contains__(self, key):
+        return key in self._cache
+
+    def add(self, key):
+        """Add ``key`` or mark it as recently seen, returns False when it
+        was already seen."""
+        if self._cache.get(key) is not None:
+            return False
+        self._cache.put(key, True)
+        return True
+
+
+class BloomSeenSet:
+    """Bloom filter sized for ``capacity`` keys with a false positive rate
+    of ``error_rate``. A false positive skips a configuration that was not
+    seen, repeats are always detected."""
+
+    def __init__(self, capacity, error_rate=0.001):
+        if capacity < 1:
+            raise SKConfigValueError("capacity must be at least 1")
+        if not 0 < error_rate < 1:
+            raise SKConfigValueError("error_rate must be in (0, 1)")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.n_bits = max(8, int(math.ceil(
+            -capacity * math.log(error_rate) / math.log(2)**2)))
+        self.n_hashes = max(1, int(round(
+            self.n_bits / capacity * math.log(2))))
+        self._bits = bytearray((self.n_bits + 7) // 8)
+        self._n_added = 0
+
+    def __len__(self):
+        return self._n_added
+
+    def _positions(self, key):
+        # Double hashing on the two halves of the key
+        first = int.from_bytes(key[:8], 'little')
+        second = int.from_bytes(key[8:16], 'little') | 1
+        for i in range(self.n_hashes):
+            yield divmod((first + i * second) % self.n_bits, 8)
+
+    def __contains__(self, key):
+        bits = self._bits
+        return all(bits[byte] & (1 << bit)
+                   for byte, bit in self._positions(key))
+
+    def add(self, key):
+        bits = self._bits
+        new = False
+        for byte, bit in self._positions(key):
+            mask = 1 << bit
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                new = True
+        if new:
+            self._n_added += 1
+        return new
+
+
+class UniqueFilter:
+    """Passes on configurations that were not seen before.
+
+    ``seen`` is ``'exact'`` to keep every key, ``'lru'`` to keep the
+    ``maxsize`` most recent ones or ``'bloom'`` for a Bloom filter sized
+    for ``maxsize`` keys with ``error_rate`` false positives. Sampling
+    stops once ``patience`` rounds in a row find nothing new, which is how
+    an exhausted space is detected.
+    """
+
+    def __init__(self, seen='exact', maxsize=None, error_rate=0.001,
+                 float_decimals=None, patience=10):
+        if seen == 'exact':
+            self.seen = ExactSeenSet()
+        elif seen in ('lru', 'bloom'):
+            if maxsize is None:
+                raise SKConfigValueError(
+                    "maxsize is required with seen='{}'".format(seen))
+            if seen == 'lru':
+                self.seen = LRUSeenSet(maxsize)
+            else:
+                self.seen = BloomSeenSet(maxsize, error_rate)
+        else:
+            raise SKConfigValueError(
+                "seen must be one of 'exact', 'lru' or 'bloom'")
+        if patience < 1:
+            raise SKConfigValueError("patience must be at least 1")
+        self.float_decimals = float_decimals
+        self.patience = patience
+
+    def __len__(self):
+        return len(self.seen)
+
+    def add(self, config):
+        """Record ``config``, returns False when it was already seen."""
+        return self.seen.add(config_key(config, self.float_decimals))
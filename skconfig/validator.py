@@ -1,49 +1,371 @@
+from abc import ABCMeta
+from weakref import WeakKeyDictionary
+from weakref import WeakSet
+
+from . import instrumentation
+from .cache import LRUCache
 from .parameter.base import Param
+from .plan import ValidationPlan
+from .grid import ValidGrid
+from .defaults import get_default_params
 from .exceptions import InvalidParamName
 from .exceptions import InactiveConditionedValue
 from .exceptions import SKConfigValueError
+from .exceptions import Violation
+
+_PLAN_ATTRIBUTES = frozenset(
+    ['conditions', 'forbiddens', 'estimator', 'validators'])
+
+
+class CheckResult:
+    """Outcome of ``BaseValidator.check_params``.
+
+    Truthy when the parameters are valid. ``errors`` holds ``Violation``
+    records whose messages are only formatted when read.
+    """
+    __slots__ = ('errors', )
+
+    def __init__(self, errors):
+        self.errors = errors
+
+    @property
+    def valid(self):
+        return not self.errors
+
+    def __bool__(self):
+        return not self.errors
+
+    def raise_first(self):
+        """Raise the exception of the first violation, if any."""
+        if self.errors:
+            # The exception may be raised again from a cached result
+            raise self.errors[0].exception().with_traceback(None)
+
+    def __repr__(self):
+        return "CheckResult(valid={}, errors={})".format(
+            self.valid, list(self.errors))
+
+
+VALID = CheckResult(())
+
+
+def _freeze_params(params):
+    # The type is part of the key so that True, 1 and 1.0 differ
+    key = tuple(
+        sorted((name, type(value), value) for name, value in params.items()))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+# Composite validator classes using a validator class as a step
+_composites = WeakKeyDictionary()
 
 
-class BaseValidator:
+class ValidatorMeta(ABCMeta):
+    """Compiles a ``ValidationPlan`` for every validator class.
+
+    The plan is rebuilt when a Param, ``conditions``, ``forbiddens``,
+    ``estimator`` or ``validators`` is reassigned on the class, which
+    ``__init_subclass__`` can not detect, on a parent class or on a step
+    validator of a composite. Deriving from ``ABCMeta`` lets validators
+    also inherit from abstract base classes.
+    """
+
+    def __init__(cls, name, bases, namespace):
+        super().__init__(name, bases, namespace)
+        cls._plan = ValidationPlan(cls)
+        cls._register_steps()
+
+    def __setattr__(cls, name, value):
+        super().__setattr__(name, value)
+        if name in _PLAN_ATTRIBUTES or isinstance(value, Param):
+            cls._compile_plan()
+
+    def __delattr__(cls, name):
+        recompile = (name in _PLAN_ATTRIBUTES
+                     or isinstance(cls.__dict__.get(name), Param))
+        super().__delattr__(name)
+        if recompile:
+            cls._compile_plan()
+
+    def _register_steps(cls):
+        # Composites compile the clauses of their steps into their own plan
+        for step in getattr(cls, 'validators', {}).values():
+            _composites.setdefault(step, WeakSet()).add(cls)
+
+    def _compile_plan(cls):
+        type.__setattr__(cls, '_plan', ValidationPlan(cls))
+        cls._register_steps()
+        for subclass in cls.__subclasses__():
+            subclass._compile_plan()
+        for composite in list(_composites.get(cls, ())):
+            composite._compile_plan()
+
+
+class BaseValidator(metaclass=ValidatorMeta):
+    """Validates the parameters of ``estimator``.
+
+    With ``cache_size`` set, on the class or passed to the constructor, the
+    outcomes of ``validate_params``, ``validate_estimator`` and the
+    ``check_*`` methods are kept in an LRU cache of that many entries, see
+    ``cache_info``. Parameters with unhashable values are validated without
+    the cache.
+    """
     conditions = []
     forbiddens = []
     estimator = None
+    cache_size = None
+    _cache = None
+    _cache_source = None
 
-    def __init__(self):
+    def __init__(self, cache_size=None):
         # check parameters forbidden and conditions are compalible
-        self.parameters_ = {
-            name: param
-            for name, param in self.__class__.__dict__.items()
-            if isinstance(param, Param)
-        }
+        self.parameters_ = self._plan.parameters
+        self._check_definition()
+        if cache_size is not None:
+            self.cache_size = cache_size
+        self._cache = (None if self.cache_size is None else LRUCache(
+            self.cache_size))
+        self._cache_source = None
+
+    def _check_definition(self):
         if self.estimator is None:
             raise SKConfigValueError("estimator must be defined")
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in _PLAN_ATTRIBUTES:
+            # Clauses assigned on the instance get a plan of their own
+            super().__setattr__('_plan', ValidationPlan(self))
+
+    @classmethod
+    def default_params(cls):
+        """Default parameters of ``estimator`` as a read only mapping."""
+        return get_default_params(cls.estimator)
+
+    def cache_info(self):
+        """``CacheInfo`` of the result cache, None when it is disabled."""
+        if self._cache is None:
+            return None
+        return self._cache.info()
+
+    def clear_cache(self):
+        if self._cache is not None:
+            self._cache.clear()
+
     def validate_params(self, **kwargs):
+        self._validate(kwargs)
+
+    def validate_estimator(self, estimator):
+        # get_params already holds every constructor parameter, the cached
+        # defaults only fill in what a custom get_params leaves out
+        self._validate(estimator.get_params())
+
+    def check_params(self, params, collect_all=False):
+        """Non raising version of ``validate_params``.
+
+        Returns a ``CheckResult`` holding the ``Violation`` found first, or
+        every violation when ``collect_all`` is True.
+        """
+        return self._check(params, collect_all)
+
+    def check_estimator(self, estimator, collect_all=False):
+        """Non raising version of ``validate_estimator``."""
+        return self._check(estimator.get_params(), collect_all)
+
+    def validate_delta(self, base_params, changes):
+        """Validate ``{**base_params, **changes}`` assuming ``base_params``
+        is already valid.
+
+        Only the changed parameters and the forbiddens and conditions that
+        depend on them are checked.
+        """
+        violation = next(self._iter_delta_violations(base_params, changes),
+                         None)
+        if violation is not None:
+            raise violation.exception()
+
+    def check_delta(self, base_params, changes, collect_all=False):
+        """Non raising version of ``validate_delta``."""
+        return self._collect(
+            self._iter_delta_violations(base_params, changes), collect_all)
+
+    def iter_grid(self, **choices):
+        """Generate the points of the grid spanned by ``choices`` that pass
+        ``validate_params``.
+
+        ``choices`` maps parameter names to lists of values, like
+        ``ParameterGrid``. Partial assignments hitting a forbidden or an
+        inactive conditioned value are pruned instead of enumerated.
+        """
+        return iter(ValidGrid(self, choices))
+
+    def count_grid(self, **choices):
+        """Number of points ``iter_grid`` generates."""
+        return ValidGrid(self, choices).count()
+
+    def _validate(self, kwargs):
+        if instrumentation.recorder is not None or self._cache is not None:
+            self._check(kwargs, False).raise_first()
+            return
+        violation = next(self._iter_violations(kwargs), None)
+        if violation is not None:
+            raise violation.exception()
+
+    def _check(self, kwargs, collect_all):
+        recorder = instrumentation.recorder
+        if recorder is not None:
+            return recorder.measure_validation(
+                instrumentation.owner_name(type(self)), self._check_plan, kwargs, collect_all)
+        return self._check_plan(kwargs, collect_all)
+
+    def _check_plan(self, kwargs, collect_all):
+        cache = self._cache
+        key = None if cache is None else _freeze_params(kwargs)
+        if key is None:
+            return self._collect(self._iter_violations(kwargs), collect_all)
+
+        # Results are dropped when the plan or the defaults change
+        source = (self._plan, self.default_params())
+        if self._cache_source is None or any(
+                new is not old
+                for new, old in zip(source, self._cache_source)):
+            cache.clear()
+            self._cache_source = source
+
+        key = (collect_all, key)
+        result = cache.get(key)
+        if result is None:
+            result = self._collect(self._iter_violations(kwargs),
+                                   collect_all)
+            cache.put(key, result)
+        return result
+
+    def _get_plan(self):
+        recorder = instrumentation.recorder
+        if recorder is None:
+            return self._plan
+        return recorder.plan(self)
+
+    def _count_violations(self, violations):
+        recorder = instrumentation.recorder
+        if recorder is None:
+            return violations
+        return recorder.count_violations(
+            instrumentation.owner_name(type(self)), violations)
+
+    @staticmethod
+    def _collect(violations, collect_all):
+        if collect_all:
+            return CheckResult(tuple(violations))
+        violation = next(violations, None)
+        if violation is None:
+            return VALID
+        return CheckResult((violation, ))
+
+    def _iter_violations(self, kwargs):
+        all_kwargs = {**self.default_params(), **kwargs}
+        plan = self._get_plan()
+        return self._count_violations(
+            self._iter_plan_violations(
+                plan, kwargs, all_kwargs, all_kwargs,
+                plan.compiled_forbiddens.violations(all_kwargs),
+                plan.conditions))
+
+    def _iter_delta_violations(self, base_params, changes):
+        all_kwargs = {
+            **self.default_params(),
+            **base_params,
+            **changes
+        }
+        plan = self._get_plan()
+        forbiddens, conditions = plan.reachable(changes)
+        forbidden_violations = (
+            forbidden.violation(all_kwargs) for forbidden in forbiddens)
+        return self._count_violations(
+            self._iter_plan_violations(plan, changes, changes, all_kwargs,
+                                       forbidden_violations, conditions))
+
+    def _iter_plan_violations(self, plan, kwargs, names, all_kwargs,
+                              forbidden_violations, conditions):
+        checkers = plan.checkers
+
         # Check kwargs get in params
         for name in kwargs:
-            if name not in self.parameters_:
-                raise InvalidParamName(name)
-
-        all_kwargs = {**self.estimator().get_params(), **kwargs}
+            if name not in checkers:
+                yield Violation(InvalidParamName, name)
 
         # check for forbidden
-        for forbidden in self.forbiddens:
-            forbidden.is_forbidden(**all_kwargs)
+        for violation in forbidden_violations:
+            if violation is not None:
+                yield violation
 
-        condition_names = [cond.child for cond in self.conditions]
-        for name, value in all_kwargs.items():
-            if name not in condition_names:
-                self.parameters_[name].validate(name, value)
+        conditioned = plan.conditioned
+        for name in names:
+            if name in conditioned:
+                continue
+            check = checkers.get(name)
+            if check is None:
+                # Unknown names given in kwargs were reported above, the
+                # others come from the estimator defaults
+                if name not in kwargs:
+                    yield Violation(InvalidParamName, name)
+                continue
+            violation = check(all_kwargs[name])
+            if violation is not None:
+                yield violation
 
         # Check conditions
-        for condition in self.conditions:
-            name = condition.child
+        for name, condition, check, is_active in conditions:
             value = all_kwargs.get(name)
-            if condition.is_active(**all_kwargs):
-                self.parameters_[name].validate(name, value)
+            if is_active(all_kwargs):
+                violation = check(value)
+                if violation is not None:
+                    yield violation
             elif value is not None:
-                raise InactiveConditionedValue(name, condition)
+                yield Violation(InactiveConditionedValue, name, condition)
 
-    def validate_estimator(self, estimator):
-        self.validate_params(**estimator.get_params())
+    def validate_many(self, data):
+        """Validate a batch of configurations at once.
+
+        ``data`` is a list of parameter dicts, a dict of columns or a
+        DataFrame. Returns a ``BatchResult`` whose ``mask`` flags the rows
+        that ``validate_params`` accepts.
+        """
+        # NumPy is only needed for batches
+        from .batch import BatchResult
+        from .batch import ColumnSet
+
+        plan = self._plan
+        columns = ColumnSet.from_data(data,
+                                      self.default_params())
+        valid = columns.full(True)
+
+        for name, column in columns.columns.items():
+            if name not in plan.parameters:
+                if name in columns.given:
+                    valid &= ~columns.given_mask(name)
+                else:
+                    valid[:] = False
+
+        for forbidden in plan.forbiddens:
+            valid &= ~forbidden.forbidden_mask(columns)
+
+        for name, column in columns.columns.items():
+            if name in plan.conditioned or name not in plan.parameters:
+                continue
+            param_valid = plan.parameters[name].column_mask(column)
+            if column.missing is not None:
+                param_valid |= column.missing
+            valid &= param_valid
+
+        for name, condition, _, _ in plan.conditions:
+            column = columns[name]
+            active = condition.active_mask(columns)
+            param_valid = plan.parameters[name].column_mask(column)
+            valid &= (active & param_valid) | (~active & column.is_none)
+
+        return BatchResult(valid, columns, self)
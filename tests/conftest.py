@@ -0,0 +1,36 @@
+import pytest
+
+from skconfig.distribution import CategoricalDistribution
+from skconfig.distribution import ConstantDistribution
+from skconfig.distribution import UniformBoolDistribution
+from skconfig.distribution import UniformFloatDistribution
+from skconfig.distribution import UniformIntDistribution
+from skconfig.distribution import UnionDistribution
+from skconfig.sampler import Sampler
+from stubs import LogRegressionValidator
+
+
+@pytest.fixture
+def validator():
+    return LogRegressionValidator()
+
+
+@pytest.fixture
+def make_sampler(validator):
+    """Builds a Sampler over the Params of ``validator``, or of ``other``
+    when it is given, e.g. a subclass with other forbiddens."""
+
+    def make(other=None, **kwargs):
+        return Sampler(
+            validator if other is None else other,
+            dual=UniformBoolDistribution(),
+            C=UniformFloatDistribution(0.0, 1.0),
+            solver=CategoricalDistribution(
+                ["newton-cg", "lbfgs", "liblinear", "sag", "saga"]),
+            random_state=UnionDistribution(
+                ConstantDistribution(None), UniformIntDistribution(0, 10)),
+            penalty=CategoricalDistribution(["l2", "l1"]),
+            multi_class=CategoricalDistribution(["ovr", "multinomial"]),
+            **kwargs)
+
+    return make
@@ -0,0 +1,53 @@
+from sklearn.base import BaseEstimator
+
+from skconfig.forbidden import ForbiddenAnd
+from skconfig.forbidden import ForbiddenEquals
+from skconfig.forbidden import ForbiddenIn
+from skconfig.parameter import BoolParam
+from skconfig.parameter import FloatIntervalParam
+from skconfig.parameter import IntIntervalParam
+from skconfig.parameter import NoneParam
+from skconfig.parameter import StringParam
+from skconfig.parameter import UnionParam
+from skconfig.validator import BaseValidator
+
+
+class LogisticRegression(BaseEstimator):
+    def __init__(self,
+                 penalty="l2",
+                 dual=False,
+                 C=1.0,
+                 solver="lbfgs",
+                 max_iter=100,
+                 multi_class="ovr",
+                 random_state=None):
+        self.penalty = penalty
+        self.dual = dual
+        self.C = C
+        self.solver = solver
+        self.max_iter = max_iter
+        self.multi_class = multi_class
+        self.random_state = random_state
+
+
+class LogRegressionValidator(BaseValidator):
+    estimator = LogisticRegression
+
+    penalty = StringParam("l2", "l1")
+    dual = BoolParam()
+    C = FloatIntervalParam(lower=0)
+    solver = StringParam("newton-cg", "lbfgs", "liblinear", "sag", "saga")
+    max_iter = IntIntervalParam(lower=1)
+    multi_class = StringParam("ovr", "multinomial")
+    random_state = UnionParam(IntIntervalParam(lower=0), NoneParam())
+
+    forbiddens = [
+        ForbiddenAnd([
+            ForbiddenEquals("penalty", "l1"),
+            ForbiddenIn("solver", ["newton-cg", "sag", "lbfgs"])
+        ]),
+        ForbiddenAnd([
+            ForbiddenEquals("solver", "liblinear"),
+            ForbiddenEquals("multi_class", "multinomial")
+        ]),
+    ]
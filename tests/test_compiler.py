@@ -0,0 +1,100 @@
+import itertools
+
+import pytest
+
+from skconfig.compiler import CompiledForbiddens
+from skconfig.compiler import compile_condition
+from skconfig.compiler import forbidden_from_atoms
+from skconfig.compiler import lower_forbidden
+from skconfig.condition import AndCondition
+from skconfig.condition import EqualsCondition
+from skconfig.condition import GreaterThanCondition
+from skconfig.condition import InCondition
+from skconfig.condition import LessThanCondition
+from skconfig.condition import NotEqualsCondition
+from skconfig.condition import OrCondition
+from skconfig.forbidden import ForbiddenAnd
+from skconfig.forbidden import ForbiddenEquals
+from skconfig.forbidden import ForbiddenIn
+
+VALUES = {
+    "a": ["x", "y", "z", None],
+    "b": [1, 2, 3, None],
+    "c": [True, False, None],
+}
+
+FORBIDDENS = [
+    ForbiddenAnd([ForbiddenEquals("a", "x"),
+                  ForbiddenIn("b", [1, 2])]),
+    ForbiddenEquals("c", False),
+    ForbiddenAnd([ForbiddenIn("b", [2, 3]),
+                  ForbiddenEquals("a", "x")]),
+    ForbiddenAnd([
+        ForbiddenIn("a", ["y", "z"]),
+        ForbiddenAnd([ForbiddenEquals("b", 3),
+                      ForbiddenEquals("c", True)])
+    ]),
+    ForbiddenIn("a", [None]),
+]
+
+
+def _all_params():
+    names = sorted(VALUES)
+    for values in itertools.product(*(VALUES[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def test_lower_forbidden():
+    assert lower_forbidden(FORBIDDENS[0]) == (("a", ("x", )), ("b", (1, 2)))
+    assert lower_forbidden(FORBIDDENS[3]) == (("a", ("y", "z")),
+                                              ("b", (3, )), ("c", (True, )))
+    assert lower_forbidden(FORBIDDENS[4]) == (("a", ()), )
+
+    rebuilt = forbidden_from_atoms(lower_forbidden(FORBIDDENS[0]))
+    assert isinstance(rebuilt, ForbiddenAnd)
+    assert [type(c) for c in rebuilt.forbidden_clauses] == [
+        ForbiddenEquals, ForbiddenIn
+    ]
+
+
+@pytest.mark.parametrize("max_table_size", [0, 4096])
+def test_compiled_forbiddens_match_clauses(max_table_size):
+    compiled = CompiledForbiddens(FORBIDDENS, max_table_size=max_table_size)
+    for params in _all_params():
+        expected = [f.violation(params) for f in FORBIDDENS]
+        expected = [v for v in expected if v is not None]
+        violations = compiled.violations(params)
+        assert [(v.error_cls, v.args) for v in violations] == [
+            (v.error_cls, v.args) for v in expected
+        ]
+        assert compiled.matches(params) == bool(expected)
+
+
+def test_compiled_forbiddens_unhashable_value():
+    compiled = CompiledForbiddens(FORBIDDENS)
+    assert not compiled.matches({"a": "x", "b": [1]})
+    assert compiled.matches({"a": "x", "b": [1], "c": False})
+
+
+def test_compile_condition_matches_evaluate():
+    conditions = [
+        EqualsCondition("d", "a", "x"),
+        NotEqualsCondition("d", "a", "x"),
+        LessThanCondition("d", "b", 2),
+        GreaterThanCondition("d", "b", 2),
+        InCondition("d", "a", ["x", "z"]),
+        OrCondition(EqualsCondition("d", "a", "x"),
+                    EqualsCondition("d", "a", "y")),
+        AndCondition(EqualsCondition("d", "a", "x"),
+                     InCondition("d", "c", [True])),
+        OrCondition(LessThanCondition("d", "b", 2),
+                    EqualsCondition("d", "c", False)),
+    ]
+    shared = {}
+    for condition in conditions:
+        predicate = compile_condition(condition, shared)
+        for params in _all_params():
+            assert predicate(params) == condition.evaluate(params)
+
+    assert (compile_condition(EqualsCondition("e", "a", "x"), shared) is
+            compile_condition(EqualsCondition("f", "a", "x"), shared))
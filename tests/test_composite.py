@@ -0,0 +1,158 @@
+import pytest
+from sklearn.base import BaseEstimator
+from sklearn.pipeline import Pipeline
+
+from skconfig.composite import CompositeValidator
+from skconfig.condition import EqualsCondition
+from skconfig.exceptions import ForbiddenValue
+from skconfig.exceptions import InactiveConditionedValue
+from skconfig.exceptions import InvalidParamChoices
+from skconfig.exceptions import InvalidParamName
+from skconfig.forbidden import ForbiddenAnd
+from skconfig.forbidden import ForbiddenEquals
+from skconfig.parameter import BoolParam
+from skconfig.parameter import FloatIntervalParam
+from skconfig.parameter import StringParam
+from skconfig.validator import BaseValidator
+
+
+class Scaler(BaseEstimator):
+    def __init__(self, with_mean=True):
+        self.with_mean = with_mean
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        return X
+
+
+class Classifier(BaseEstimator):
+    def __init__(self, penalty="l2", solver="lbfgs", l1_ratio=None):
+        self.penalty = penalty
+        self.solver = solver
+        self.l1_ratio = l1_ratio
+
+
+class ScalerValidator(BaseValidator):
+    estimator = Scaler
+    with_mean = BoolParam()
+
+
+class ClassifierValidator(BaseValidator):
+    estimator = Classifier
+    penalty = StringParam("l2", "l1", "elasticnet")
+    solver = StringParam("lbfgs", "saga")
+    l1_ratio = FloatIntervalParam(lower=0, upper=1)
+
+    conditions = [EqualsCondition("l1_ratio", "penalty", "elasticnet")]
+    forbiddens = [
+        ForbiddenAnd([
+            ForbiddenEquals("penalty", "l1"),
+            ForbiddenEquals("solver", "lbfgs")
+        ])
+    ]
+
+
+class PipelineValidator(CompositeValidator):
+    validators = {"scale": ScalerValidator, "clf": ClassifierValidator}
+    verbose = BoolParam()
+
+
+@pytest.fixture
+def pipeline_validator():
+    return PipelineValidator()
+
+
+def make_pipeline(**params):
+    return Pipeline([("scale", Scaler()), ("clf", Classifier(**params))])
+
+
+def test_plan_is_flattened(pipeline_validator):
+    plan = PipelineValidator._plan
+    assert set(plan.parameters) == {
+        "verbose", "scale__with_mean", "clf__penalty", "clf__solver",
+        "clf__l1_ratio"
+    }
+    assert plan.conditioned == {"clf__l1_ratio"}
+    forbidden, = plan.forbiddens
+    assert forbidden.names == {"clf__penalty", "clf__solver"}
+
+
+def test_validate_pipeline(pipeline_validator):
+    pipeline_validator.validate_estimator(make_pipeline(penalty="l1", solver="saga"))
+    pipeline_validator.validate_estimator(
+        make_pipeline(penalty="elasticnet", solver="saga", l1_ratio=0.5))
+
+    with pytest.raises(ForbiddenValue, match="clf__penalty"):
+        pipeline_validator.validate_estimator(make_pipeline(penalty="l1"))
+    with pytest.raises(InvalidParamChoices, match="clf__solver"):
+        pipeline_validator.validate_estimator(make_pipeline(solver="sag"))
+    with pytest.raises(InactiveConditionedValue):
+        pipeline_validator.validate_estimator(make_pipeline(l1_ratio=0.5))
+
+    result = pipeline_validator.check_estimator(make_pipeline(penalty="l1"))
+    assert not result
+
+
+def test_validate_params_uses_step_defaults(pipeline_validator):
+    pipeline_validator.validate_params(clf__penalty="l1", clf__solver="saga")
+    with pytest.raises(ForbiddenValue):
+        pipeline_validator.validate_params(clf__penalty="l1")
+    with pytest.raises(InvalidParamName):
+        pipeline_validator.validate_params(clff__penalty="l1")
+
+    defaults = PipelineValidator.default_params()
+    assert PipelineValidator.default_params() is defaults
+    assert defaults["clf__solver"] == "lbfgs"
+    assert defaults["scale__with_mean"] is True
+
+
+def test_nested_composite():
+    class OuterValidator(CompositeValidator):
+        validators = {"pipe": PipelineValidator}
+
+    validator = OuterValidator()
+    with pytest.raises(ForbiddenValue, match="pipe__clf__penalty"):
+        validator.validate_params(pipe__clf__penalty="l1")
+
+
+def test_validators_required():
+    with pytest.raises(ValueError, match="validators must be defined"):
+        CompositeValidator()
+
+
+def test_composite_cache_size():
+    class CachedValidator(PipelineValidator):
+        cache_size = 16
+
+    validator = CachedValidator()
+    assert validator.cache_info().maxsize == 16
+    validator.validate_params(clf__penalty="l2")
+    validator.validate_params(clf__penalty="l2")
+    assert validator.cache_info().hits == 1
+    assert PipelineValidator(cache_size=2).cache_info().maxsize == 2
+
+
+def test_plan_follows_step_changes():
+    class StepValidator(ClassifierValidator):
+        pass
+
+    class StepPipelineValidator(CompositeValidator):
+        validators = {"clf": StepValidator}
+
+    class OuterValidator(CompositeValidator):
+        validators = {"pipe": StepPipelineValidator}
+
+    validator = StepPipelineValidator(cache_size=10)
+    outer = OuterValidator()
+    validator.validate_params(clf__penalty="l2", clf__solver="saga")
+    outer.validate_params(pipe__clf__solver="saga")
+
+    StepValidator.forbiddens = [ForbiddenEquals("solver", "saga")]
+    with pytest.raises(ForbiddenValue):
+        validator.validate_params(clf__penalty="l2", clf__solver="saga")
+    with pytest.raises(ForbiddenValue):
+        outer.validate_params(pipe__clf__solver="saga")
+    # The class used as a step elsewhere is left alone
+    PipelineValidator().validate_params(clf__solver="saga")
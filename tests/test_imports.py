@@ -0,0 +1,32 @@
+import subprocess
+import sys
+
+
+def imported_modules(statement):
+    # -X importtime writes one line per imported module to stderr
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                             statement],
+                            stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE,
+                            universal_newlines=True,
+                            check=True)
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            modules.add(line.rsplit('|', 1)[1].strip())
+    return modules
+
+
+def test_validation_does_not_import_numpy_or_configspace():
+    modules = imported_modules(
+        "import skconfig.validator, skconfig.parameter, "
+        "skconfig.condition, skconfig.forbidden")
+    assert 'skconfig.validator' in modules
+    heavy = {m for m in modules if m.split('.')[0] in ('numpy', 'ConfigSpace')}
+    assert not heavy
+
+
+def test_sampler_does_not_import_configspace():
+    modules = imported_modules("import skconfig.sampler")
+    assert 'skconfig.sampler' in modules
+    assert not {m for m in modules if m.startswith('ConfigSpace')}
@@ -0,0 +1,83 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from skconfig import instrumentation
+from skconfig.distribution import CategoricalDistribution
+from skconfig.sampler import Sampler
+
+
+def test_disabled_by_default():
+    assert instrumentation.recorder is None
+    assert instrumentation.snapshot() is None
+
+
+def test_validation_counters(validator):
+    events = []
+    with instrumentation.instrument(
+            lambda event, data: events.append((event, data))):
+        validator.validate_params(max_iter=10)
+        with pytest.raises(ValueError):
+            validator.validate_params(penalty="l1")
+        assert not validator.check_params({"max_iter": 0}, collect_all=True)
+        snapshot = instrumentation.snapshot()
+    assert instrumentation.recorder is None
+
+    assert snapshot['validations'] == 3
+    assert [data['valid'] for _, data in events] == [True, False, False]
+    owner = instrumentation.owner_name(type(validator))
+    assert owner == 'stubs.LogRegressionValidator'
+    params = snapshot['params'][owner]
+    # Validation stops at the forbidden value of the second call
+    assert params['max_iter']['calls'] == 2
+    assert params['max_iter']['hits'] == 1
+    forbidden = snapshot['forbiddens'][owner][
+        "0: {}".format(validator.forbiddens[0])]
+    assert forbidden['calls'] == 3
+    assert forbidden['hits'] == 1
+    assert snapshot['failures'] == {
+        'ForbiddenValue': {owner: {"penalty and solver": 1}},
+        'InvalidParamRange': {owner: {'max_iter': 1}},
+    }
+
+
+def test_classes_with_the_same_name_are_kept_apart(validator):
+    class LogRegressionValidator(type(validator)):
+        max_iter = type(validator).max_iter.__class__(lower=1, upper=10)
+
+    with instrumentation.instrument() as recorder:
+        validator.validate_params(max_iter=15)
+        assert not LogRegressionValidator().check_params({"max_iter": 15})
+        snapshot = recorder.snapshot()
+
+    outer = instrumentation.owner_name(type(validator))
+    inner = instrumentation.owner_name(LogRegressionValidator)
+    assert inner.endswith("<locals>.LogRegressionValidator")
+    assert snapshot['params'][outer]['max_iter']['hits'] == 0
+    assert snapshot['params'][inner]['max_iter']['hits'] == 1
+    assert snapshot['failures'] == {
+        'InvalidParamRange': {inner: {'max_iter': 1}}}
+
+
+def test_timed_counts_from_threads(validator):
+    with instrumentation.instrument() as recorder:
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(lambda _: validator.check_params(
+                {"max_iter": 10}), range(4000)))
+        stats = recorder.snapshot()['params']
+    max_iter, = (params['max_iter'] for params in stats.values())
+    assert max_iter['calls'] == 4000
+
+
+def test_sampler_acceptance(validator):
+    sampler = Sampler(validator, engine='numpy', seed=0,
+                      engine_options={'max_feasible_size': 0},
+                      penalty=CategoricalDistribution(["l2", "l1"]),
+                      solver=CategoricalDistribution(["lbfgs", "saga"]))
+    with instrumentation.instrument() as recorder:
+        sampler.sample(1000)
+    stats = recorder.snapshot()['sampler']
+    assert stats['batches'][0]['engine'] == 'numpy'
+    assert stats['acceptance_rate'] == pytest.approx(0.75, abs=0.05)
+    rejections, = stats['forbidden_rejections'].values()
+    assert rejections == stats['drawn'] - stats['accepted']
@@ -1,6 +1,17 @@
+import pytest
+
 from skconfig.parameter import BoolParam
+from skconfig.parameter.base import Param
 
 
 def test_bool_param_type():
     p = BoolParam()
     assert p.value_type == bool
+
+
+def test_param_requires_validate_or_checker():
+    class IncompleteParam(Param):
+        pass
+
+    with pytest.raises(TypeError, match="without validate or checker"):
+        IncompleteParam()
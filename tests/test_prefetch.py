@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from skconfig.prefetch import AsyncSampler
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_async_sampler_matches_sampler(make_sampler):
+    expected = make_sampler(engine='numpy', seed=0).sample(25)
+
+    async def ask():
+        async with AsyncSampler(make_sampler(engine='numpy', seed=0),
+                                maxsize=10, batch_size=25) as sampler:
+            return [await sampler.next() for _ in range(25)]
+
+    assert run(ask()) == expected
+
+
+def test_async_sampler_backpressure_and_close(make_sampler, validator):
+    async def ask():
+        sampler = AsyncSampler(make_sampler(), maxsize=5, batch_size=3)
+        configs = []
+        async for config in sampler:
+            configs.append(config)
+            if len(configs) == 12:
+                break
+        await asyncio.sleep(0.2)
+        assert sampler.qsize() <= 5
+        await sampler.aclose()
+        assert not sampler._thread.is_alive()
+        with pytest.raises(StopAsyncIteration):
+            await sampler.next()
+        return configs
+
+    for config in run(ask()):
+        validator.validate_params(**config)
+
+
+def test_async_sampler_cancelled_next_keeps_configs(make_sampler):
+    expected = make_sampler(engine='numpy', seed=0).sample(10)
+
+    async def ask():
+        async with AsyncSampler(make_sampler(engine='numpy', seed=0),
+                                maxsize=10, batch_size=10) as sampler:
+            for _ in range(5):
+                task = asyncio.ensure_future(sampler.next())
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+            return [await sampler.next() for _ in range(10)]
+
+    assert run(ask()) == expected
+
+
+def test_async_sampler_raises_worker_errors(validator):
+    class FailingSampler:
+        def sample(self, size):
+            raise ValueError("failed")
+
+    FailingSampler.validator = validator
+
+    async def ask():
+        sampler = AsyncSampler(FailingSampler())
+        # The first pending call gets the error, the other one stops
+        first, second = [asyncio.ensure_future(sampler.next())
+                         for _ in range(2)]
+        with pytest.raises(ValueError, match="failed"):
+            await first
+        with pytest.raises(StopAsyncIteration):
+            await second
+        with pytest.raises(StopAsyncIteration):
+            await sampler.next()
+        await sampler.aclose()
+
+    run(ask())
+
+
+def test_async_sampler_needs_running_loop(make_sampler):
+    with pytest.raises(RuntimeError):
+        AsyncSampler(make_sampler())
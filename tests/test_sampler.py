@@ -0,0 +1,435 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from skconfig.sampler import Sampler
+from skconfig.sampler import clear_space_cache
+from skconfig.sampler import space_cache_info
+from skconfig.distribution import CategoricalDistribution
+from skconfig.distribution import ConstantDistribution
+from skconfig.distribution import UniformBoolDistribution
+from skconfig.distribution import UniformFloatDistribution
+from skconfig.distribution import UniformIntDistribution
+from skconfig.distribution import UnionDistribution
+from skconfig.exceptions import SKConfigValueError
+from skconfig.forbidden import ForbiddenAnd
+from skconfig.forbidden import ForbiddenEquals
+from skconfig.forbidden import ForbiddenIn
+from skconfig.unique import UniqueFilter
+from stubs import LogRegressionValidator
+
+
+def test_samples_are_valid(validator, make_sampler):
+    sampler = make_sampler()
+    samples = sampler.sample(200)
+    assert len(samples) == 200
+    for sample in samples:
+        assert set(sample) == {
+            "dual", "C", "solver", "random_state", "penalty", "multi_class"
+        }
+        validator.validate_params(**sample)
+
+
+def test_active_forbiddens_pruned_to_distributions(validator):
+    sampler = Sampler(
+        validator,
+        penalty=CategoricalDistribution(["l2", "l1"]),
+        solver=CategoricalDistribution(["lbfgs", "saga"]),
+        multi_class=ConstantDistribution("multinomial"))
+
+    assert len(sampler.normalized_forbiddens) == 1
+    forbidden = sampler.normalized_forbiddens[0]
+    assert isinstance(forbidden, ForbiddenAnd)
+    assert [(c.name, c.value) for c in forbidden.forbidden_clauses] == [
+        ("penalty", "l1"), ("solver", "lbfgs")
+    ]
+
+
+def test_to_dict_round_trip(validator, make_sampler):
+    sampler = make_sampler()
+    serialized = json.dumps(sampler.to_dict())
+    loaded = Sampler(validator).from_dict(json.loads(serialized))
+    assert loaded.to_dict() == sampler.to_dict()
+    for sample in loaded.sample(20):
+        validator.validate_params(**sample)
+
+
+def test_numpy_engine_samples_are_valid(validator, make_sampler):
+    sampler = make_sampler(engine='numpy')
+    samples = sampler.sample(500)
+    assert len(samples) == 500
+    for sample in samples:
+        assert set(sample) == {
+            "dual", "C", "solver", "random_state", "penalty", "multi_class"
+        }
+        validator.validate_params(**sample)
+
+
+def test_numpy_engine_matches_configspace(validator, make_sampler):
+    def frequencies(engine):
+        samples = make_sampler(engine=engine).sample(4000)
+        counts = {}
+        for sample in samples:
+            key = (sample["penalty"], sample["solver"])
+            counts[key] = counts.get(key, 0) + 1
+        return {key: count / len(samples) for key, count in counts.items()}
+
+    expected = frequencies('configspace')
+    result = frequencies('numpy')
+    assert set(result) == set(expected)
+    for key, freq in expected.items():
+        assert result[key] == pytest.approx(freq, abs=0.04)
+
+
+def test_numpy_engine_matches_configspace_numeric(validator):
+    def draw(engine):
+        sampler = Sampler(
+            validator, engine=engine, seed=0,
+            max_iter=UniformIntDistribution(1, 100, log=True),
+            C=UniformFloatDistribution(1e-3, 1e2, log=True),
+            random_state=UnionDistribution(
+                ConstantDistribution(None), UniformIntDistribution(0, 10)))
+        samples = sampler.sample(20000)
+        max_iter = np.array([sample["max_iter"] for sample in samples])
+        C = np.array([sample["C"] for sample in samples])
+        random_state = [sample["random_state"] for sample in samples]
+        states = np.array([-1 if state is None else state
+                           for state in random_state])
+        return max_iter, C, states
+
+    def binned(values, edges):
+        return np.histogram(values, bins=edges)[0] / len(values)
+
+    expected = draw('configspace')
+    result = draw('numpy')
+    int_edges = [1, 2, 3, 5, 11, 31, 101]
+    np.testing.assert_allclose(binned(result[0], int_edges),
+                               binned(expected[0], int_edges), atol=0.02)
+    float_edges = [1e-3, 1e-2, 1e-1, 1, 10, 1e2]
+    np.testing.assert_allclose(binned(result[1], float_edges),
+                               binned(expected[1], float_edges), atol=0.02)
+    # None is stored as -1, then the int branch
+    state_edges = [-1, 0, 4, 8, 11]
+    np.testing.assert_allclose(binned(result[2], state_edges),
+                               binned(expected[2], state_edges), atol=0.02)
+
+
+def test_invalid_engine(validator, make_sampler):
+    with pytest.raises(ValueError, match="engine must be one of"):
+        make_sampler(engine='unknown')
+
+
+def test_numpy_engine_adapts_batch_size(validator, make_sampler):
+    # Enumerating the feasible assignments would skip rejection
+    sampler = make_sampler(engine='numpy',
+                           engine_options={'max_feasible_size': 0})
+    engine = sampler._engine
+    sampler.sample(1000)
+
+    draws = []
+    draw = engine.draw
+
+    def counting_draw(n):
+        draws.append(n)
+        return draw(n)
+
+    engine.draw = counting_draw
+    assert len(sampler.sample(1000)) == 1000
+    assert len(draws) <= 2
+    assert engine.acceptance_rate == pytest.approx(0.6, abs=0.05)
+
+
+def test_numpy_engine_samples_feasible_assignments(validator, make_sampler):
+    sampler = make_sampler(engine='numpy')
+    engine = sampler._engine
+    names, grid, _ = engine.feasible
+    assert names == ["solver", "penalty", "multi_class"]
+    # 20 combinations, 6 with l1 and 2 with liblinear and multinomial
+    assert grid.shape == (3, 12)
+    assert engine.forbiddens == []
+
+    samples = sampler.sample(500)
+    assert engine.acceptance_rate > 0.99
+    for sample in samples:
+        validator.validate_params(**sample)
+
+
+def test_numpy_engine_feasible_assignments_with_bool(make_sampler):
+    class BoolForbiddenValidator(LogRegressionValidator):
+        forbiddens = [
+            ForbiddenAnd([
+                ForbiddenEquals("dual", True),
+                ForbiddenIn("penalty", ["l1"])
+            ])
+        ]
+
+    validator = BoolForbiddenValidator()
+    sampler = make_sampler(validator, engine='numpy', seed=0)
+    engine = sampler._engine
+    names, grid, probabilities = engine.feasible
+    assert names == ["dual", "penalty"]
+    assert grid.shape == (2, 3)
+    np.testing.assert_allclose(probabilities, 1 / 3)
+    assert engine.forbiddens == []
+
+    samples = sampler.sample(300)
+    assert engine.acceptance_rate > 0.99
+    for sample in samples:
+        validator.validate_params(**sample)
+        assert not (sample["dual"] and sample["penalty"] == "l1")
+
+
+def test_numpy_engine_uniform_feasible_weights(validator, make_sampler):
+    sampler = make_sampler(engine='numpy', seed=0,
+                           engine_options={'feasible_weights': 'uniform'})
+    counts = {}
+    for sample in sampler.sample(6000):
+        key = (sample["solver"], sample["penalty"], sample["multi_class"])
+        counts[key] = counts.get(key, 0) + 1
+    assert len(counts) == 12
+    for count in counts.values():
+        assert count == pytest.approx(500, rel=0.2)
+
+    with pytest.raises(ValueError, match="feasible_weights must be"):
+        make_sampler(engine='numpy',
+                     engine_options={'feasible_weights': 'other'})
+
+
+def test_numpy_engine_falls_back_to_rejection(validator, make_sampler):
+    sampler = make_sampler(engine='numpy',
+                           engine_options={'max_feasible_size': 10})
+    assert sampler._engine.feasible is None
+    assert len(sampler._engine.forbiddens) == 2
+    for sample in sampler.sample(200):
+        validator.validate_params(**sample)
+
+
+def test_numpy_engine_fails_when_everything_is_forbidden(make_sampler):
+    class ForbidAllValidator(LogRegressionValidator):
+        forbiddens = [ForbiddenIn("penalty", ["l2", "l1"])]
+
+    validator = ForbidAllValidator()
+    with pytest.raises(ValueError, match="Every assignment of penalty"):
+        make_sampler(validator, engine='numpy')
+
+    sampler = make_sampler(validator, engine='numpy',
+                           engine_options={'max_feasible_size': 0})
+    with pytest.raises(ValueError, match="Only 0 of"):
+        sampler.sample(10)
+
+
+@pytest.mark.parametrize('engine', ['configspace', 'numpy', 'sobol'])
+def test_bool_forbidden(engine, make_sampler):
+    class BoolForbiddenValidator(LogRegressionValidator):
+        forbiddens = [
+            ForbiddenAnd([
+                ForbiddenEquals("dual", True),
+                ForbiddenEquals("penalty", "l1")
+            ])
+        ]
+
+    validator = BoolForbiddenValidator()
+    sampler = make_sampler(validator, engine=engine, seed=0)
+    samples = sampler.sample(200)
+    for sample in samples:
+        validator.validate_params(**sample)
+    assert {(s["dual"], s["penalty"]) for s in samples} == {
+        (True, "l2"), (False, "l2"), (False, "l1")}
+
+
+def test_config_space_only_built_for_configspace_engine(validator, make_sampler):
+    clear_space_cache()
+    sampler = make_sampler(engine='numpy')
+    assert sampler.config_space is None
+    assert make_sampler().config_space is not None
+    assert space_cache_info().misses == 2
+
+
+@pytest.mark.parametrize('engine', ['configspace', 'numpy'])
+def test_iter_samples(validator, engine, make_sampler):
+    sampler = make_sampler(engine=engine)
+
+    batches = list(sampler.iter_samples(batch_size=4, n_samples=10,
+                                        batches=True))
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+
+    samples = sampler.iter_samples(batch_size=3)
+    for _, sample in zip(range(20), samples):
+        validator.validate_params(**sample)
+    samples.close()
+
+
+@pytest.mark.parametrize('engine', ['configspace', 'numpy'])
+def test_seed_reproducible(validator, engine, make_sampler):
+    first = make_sampler(engine=engine, seed=0)
+    second = make_sampler(engine=engine, seed=0)
+    assert first.sample(20) == second.sample(20)
+    assert first.sample(5) == second.sample(5)
+
+
+@pytest.mark.parametrize('engine', ['configspace', 'numpy'])
+def test_sample_parallel_does_not_depend_on_n_jobs(validator, engine, make_sampler):
+    def sample(n_jobs):
+        sampler = make_sampler(engine=engine, seed=42)
+        return sampler.sample_parallel(250, n_jobs=n_jobs, chunk_size=100)
+
+    serial = sample(1)
+    assert len(serial) == 250
+    assert sample(2) == serial
+    assert sample(3) == serial
+
+
+@pytest.mark.parametrize('engine', ['configspace', 'numpy'])
+def test_sample_at(validator, engine, make_sampler):
+    sampler = make_sampler(engine=engine, seed=7)
+    samples = sampler.sample_at(range(50))
+    for sample in samples:
+        validator.validate_params(**sample)
+    assert len({json.dumps(sample, sort_keys=True)
+                for sample in samples}) == 50
+
+    other = make_sampler(engine='numpy', seed=7)
+    other.sample(10)
+    assert other.sample_at([30, 2, 2**40]) == (
+        [samples[30], samples[2]] + sampler.sample_at([2**40]))
+    assert make_sampler(seed=8).sample_at([0]) != samples[:1]
+
+
+def test_config_space_shared_between_samplers(validator, make_sampler):
+    clear_space_cache()
+    first = make_sampler(seed=0)
+    second = make_sampler(LogRegressionValidator(), seed=1)
+    assert second.config_space is first.config_space
+    assert second.normalized_forbiddens is first.normalized_forbiddens
+    assert space_cache_info().hits == 1
+    assert space_cache_info().misses == 1
+
+    # Sharing the space does not share the random state
+    assert first.sample(5) == make_sampler(seed=0).sample(5)
+    assert first.sample(5) != second.sample(5)
+
+    other = Sampler(validator, C=UniformFloatDistribution(0.0, 2.0))
+    assert other.config_space is not first.config_space
+
+
+def test_shared_config_space_sampled_from_threads(validator, make_sampler):
+    def draw(seed):
+        sampler = make_sampler(seed=seed)
+        return [sampler.sample(20) for _ in range(20)]
+
+    expected = [draw(seed) for seed in range(4)]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        result = list(executor.map(draw, range(4)))
+    assert result == expected
+
+
+@pytest.mark.parametrize('engine', ['configspace', 'numpy'])
+def test_sample_as_batch(validator, engine, make_sampler):
+    sampler = make_sampler(engine=engine, seed=0)
+    batch = sampler.sample(100, as_batch=True)
+    assert len(batch) == 100
+    for sample in batch:
+        validator.validate_params(**sample)
+    assert batch.nbytes < 100 * 64
+
+
+def test_config_space_readers_match_post_process(validator, make_sampler):
+    sampler = make_sampler(seed=0)
+    engine = sampler._engine
+    configs = sampler.config_space.sample_configuration(50)
+    for config in configs:
+        expected = dict(config)
+        for name, dist in sampler.hps.items():
+            dist.post_process(name, expected)
+        assert engine.to_params(dict(config)) == expected
+
+
+def test_union_with_bool_branch(validator):
+    sampler = Sampler(
+        validator,
+        random_state=UnionDistribution(
+            ConstantDistribution(None), UniformBoolDistribution()))
+    values = {sample["random_state"] for sample in sampler.sample(50)}
+    assert values <= {None, True, False}
+    assert len(values) > 1
+
+
+@pytest.mark.parametrize('engine', ['sobol', 'lhs'])
+def test_qmc_engines_samples_are_valid(validator, engine, make_sampler):
+    sampler = make_sampler(engine=engine, seed=0)
+    samples = sampler.sample(300)
+    assert len(samples) == 300
+    for sample in samples:
+        validator.validate_params(**sample)
+    assert {sample["random_state"] is None for sample in samples} == {
+        True, False}
+
+
+def test_qmc_engines_stratify(validator):
+    sampler = Sampler(validator, engine='lhs', seed=0,
+                      C=UniformFloatDistribution(0.0, 1.0))
+    bins = np.floor([sample["C"] * 100 for sample in sampler.sample(100)])
+    assert sorted(bins) == list(range(100))
+
+    sampler = Sampler(validator, engine='sobol', seed=0,
+                      penalty=CategoricalDistribution(["l2", "l1"]),
+                      dual=UniformBoolDistribution())
+    samples = sampler.sample(64)
+    assert sum(sample["penalty"] == "l1" for sample in samples) == 32
+    assert sum(sample["dual"] for sample in samples) == 32
+
+
+def test_qmc_engine_options(validator):
+    dists = dict(C=UniformFloatDistribution(0.0, 1.0),
+                 penalty=CategoricalDistribution(["l2", "l1"]))
+    # Without scrambling the sequence does not depend on the seed
+    samples = [
+        Sampler(validator, engine='sobol', seed=seed,
+                engine_options={'scramble': False}, **dists).sample(8)
+        for seed in (0, 1)
+    ]
+    assert samples[0] == samples[1]
+    assert samples[0][0]["C"] == 0.0
+
+    sampler = Sampler(validator, engine='lhs', seed=0,
+                      engine_options={'scramble': False, 'strength': 1},
+                      **dists)
+    assert len(sampler.sample(10)) == 10
+
+    with pytest.raises(SKConfigValueError,
+                       match=r"Unknown options \['max_feasible_size'\]"):
+        Sampler(validator, engine='sobol',
+                engine_options={'max_feasible_size': 0}, **dists)
+    with pytest.raises(SKConfigValueError, match="strength"):
+        Sampler(validator, engine='sobol', engine_options={'strength': 2},
+                **dists)
+
+
+@pytest.mark.parametrize('engine', ['configspace', 'numpy'])
+def test_unique_samples_stop_when_exhausted(validator, engine):
+    sampler = Sampler(
+        validator, engine=engine, seed=0,
+        solver=CategoricalDistribution(
+            ["newton-cg", "lbfgs", "liblinear", "sag", "saga"]),
+        penalty=CategoricalDistribution(["l2", "l1"]),
+        multi_class=CategoricalDistribution(["ovr", "multinomial"]))
+    samples = sampler.sample(50, unique=True)
+    # 12 of the 20 combinations are not forbidden
+    assert len(samples) == 12
+    keys = {tuple(sorted(sample.items())) for sample in samples}
+    assert len(keys) == 12
+
+    streamed = list(sampler.iter_samples(batch_size=5, unique=True))
+    assert len(streamed) == 12
+
+
+def test_unique_filter_spans_calls(validator, make_sampler):
+    sampler = make_sampler(engine='numpy', seed=0)
+    unique = UniqueFilter(float_decimals=1)
+    first = sampler.sample(100, unique=unique)
+    second = sampler.sample(100, unique=unique, as_batch=True)
+    assert len(first) == 100
+    assert len(second) == 100
+    assert len(unique) == 200
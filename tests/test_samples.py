@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from skconfig.distribution import CategoricalDistribution
+from skconfig.distribution import ConstantDistribution
+from skconfig.distribution import UniformBoolDistribution
+from skconfig.distribution import UniformIntDistribution
+from skconfig.distribution import UnionDistribution
+from skconfig.samples import SampleBatch
+
+
+@pytest.fixture
+def hps():
+    return {
+        'solver': CategoricalDistribution(['lbfgs', 'saga', 'sag']),
+        'dual': UniformBoolDistribution(),
+        'max_iter': UniformIntDistribution(1, 100),
+        'random_state': UnionDistribution(
+            ConstantDistribution(None), UniformIntDistribution(0, 10)),
+    }
+
+
+def make_batch(hps, n, seed=0):
+    rng = np.random.default_rng(seed)
+    columns = {name: dist.sample_column(n, rng) for name, dist in hps.items()}
+    active = {'max_iter': rng.random(n) < 0.5}
+    return SampleBatch(columns, active, n)
+
+
+def test_sample_batch_records(hps):
+    batch = make_batch(hps, 50)
+    records = batch.to_records()
+    assert len(records) == len(batch) == 50
+    assert list(batch) == records
+    assert [batch[i] for i in range(50)] == records
+    assert batch[-1] == records[-1]
+
+    for record, active in zip(records, batch.active['max_iter']):
+        assert ('max_iter' in record) == active
+        assert record['solver'] in ('lbfgs', 'saga', 'sag')
+        assert isinstance(record['dual'], bool)
+        assert (record['random_state'] is None
+                or 0 <= record['random_state'] <= 10)
+    assert batch.columns['solver'].codes.dtype == np.uint8
+
+
+def test_sample_batch_slices_are_views(hps):
+    batch = make_batch(hps, 50)
+    chunk = batch[10:20]
+    assert len(chunk) == 10
+    assert chunk.to_records() == batch.to_records()[10:20]
+    assert np.shares_memory(chunk.columns['solver'].codes,
+                            batch.columns['solver'].codes)
+    assert np.shares_memory(chunk.columns['random_state'].branches,
+                            batch.columns['random_state'].branches)
+
+
+def test_sample_batch_from_records_and_concatenate(hps):
+    batch = make_batch(hps, 30)
+    records = batch.to_records()
+    encoded = SampleBatch.from_records(records, hps)
+    assert encoded.to_records() == records
+
+    merged = SampleBatch.concatenate([batch[:10], encoded[10:]])
+    assert merged.to_records() == records
@@ -0,0 +1,55 @@
+import io
+
+import numpy as np
+
+from skconfig.distribution import CategoricalDistribution
+from skconfig.distribution import ConstantDistribution
+from skconfig.distribution import UniformBoolDistribution
+from skconfig.distribution import UniformFloatDistribution
+from skconfig.distribution import UnionDistribution
+from skconfig.distribution import load_dist_dict
+from skconfig.samples import SampleBatch
+from skconfig.serialization import iter_jsonl
+from skconfig.serialization import load_samples
+from skconfig.serialization import save_samples
+from skconfig.serialization import write_jsonl
+
+HPS = {
+    'solver': CategoricalDistribution(['lbfgs', 'saga', None]),
+    'dual': UniformBoolDistribution(),
+    'C': UniformFloatDistribution(0.1, 1.0, log=True),
+    'random_state': UnionDistribution(
+        ConstantDistribution(None), UniformFloatDistribution(0, 1)),
+}
+
+
+def make_batch(n):
+    rng = np.random.default_rng(0)
+    columns = {name: dist.sample_column(n, rng) for name, dist in HPS.items()}
+    return SampleBatch(columns, {'C': rng.random(n) < 0.5}, n)
+
+
+def test_dist_dict_round_trip():
+    for dist in HPS.values():
+        assert load_dist_dict(dist.to_dict()).to_dict() == dist.to_dict()
+
+
+def test_jsonl_round_trip():
+    batch = make_batch(20)
+    fp = io.StringIO()
+    assert write_jsonl(batch, fp) == 20
+    fp.seek(0)
+    assert list(iter_jsonl(fp)) == batch.to_records()
+
+
+def test_npz_round_trip():
+    batch = make_batch(20)
+    spec = {name: dist.to_dict() for name, dist in HPS.items()}
+    fp = io.BytesIO()
+    save_samples(fp, batch, spec=spec)
+    fp.seek(0)
+
+    loaded, loaded_spec = load_samples(fp)
+    assert loaded_spec == spec
+    assert loaded.to_records() == batch.to_records()
+    assert loaded.columns['solver'].codes.dtype == np.uint8
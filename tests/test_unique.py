@@ -0,0 +1,63 @@
+import pytest
+
+from skconfig.unique import BloomSeenSet
+from skconfig.unique import LRUSeenSet
+from skconfig.unique import UniqueFilter
+from skconfig.unique import config_key
+
+
+def test_config_key_is_canonical():
+    assert config_key({'a': 1, 'b': 'x'}) == config_key({'b': 'x', 'a': 1})
+    assert config_key({'a': 1}) != config_key({'a': 2})
+    assert config_key({'C': 0.1234}) != config_key({'C': 0.1231})
+    assert (config_key({'C': 0.1234}, float_decimals=2) ==
+            config_key({'C': 0.1231}, float_decimals=2))
+
+
+@pytest.mark.parametrize('seen', ['exact', 'lru', 'bloom'])
+def test_unique_filter_detects_repeats(seen):
+    unique = UniqueFilter(seen=seen, maxsize=100)
+    assert unique.add({'a': 1})
+    assert unique.add({'a': 2})
+    assert not unique.add({'a': 1})
+    assert len(unique) == 2
+
+
+def test_lru_filter_forgets_old_configs():
+    unique = UniqueFilter(seen='lru', maxsize=2)
+    for value in range(3):
+        assert unique.add({'a': value})
+    assert unique.add({'a': 0})
+    assert not unique.add({'a': 2})
+
+
+def test_lru_membership_has_no_side_effects():
+    seen = LRUSeenSet(2)
+    first, second, third = (config_key({'a': value}) for value in range(3))
+    seen.add(first)
+    seen.add(second)
+    info = seen._cache.info()
+    assert first in seen
+    assert third not in seen
+    assert seen._cache.info() == info
+    # The membership test did not refresh first, so it is evicted
+    seen.add(third)
+    assert first not in seen
+    assert second in seen
+
+
+def test_bloom_false_positive_rate():
+    seen = BloomSeenSet(1000, error_rate=0.01)
+    for value in range(1000):
+        seen.add(config_key({'a': value}))
+    assert config_key({'a': 0}) in seen
+    false_positives = sum(
+        config_key({'b': value}) in seen for value in range(10000))
+    assert false_positives < 300
+
+
+def test_unique_filter_invalid_options():
+    with pytest.raises(ValueError, match="seen must be one of"):
+        UniqueFilter(seen='unknown')
+    with pytest.raises(ValueError, match="maxsize is required"):
+        UniqueFilter(seen='bloom')
@@ -0,0 +1,480 @@
+from abc import ABC, abstractmethod
+import random
+import re
+
+import numpy as np
+import pytest
+from sklearn.base import BaseEstimator
+from sklearn.model_selection import ParameterGrid
+
+from skconfig.validator import BaseValidator
+from skconfig.condition import EqualsCondition
+from skconfig.condition import LessThanCondition
+from skconfig.forbidden import ForbiddenAnd
+from skconfig.forbidden import ForbiddenEquals
+from skconfig.forbidden import ForbiddenIn
+from skconfig.parameter import BoolParam
+from skconfig.parameter import FloatIntervalParam
+from skconfig.parameter import IntIntervalParam
+from skconfig.parameter import NoneParam
+from skconfig.parameter import StringParam
+from skconfig.parameter import UnionParam
+from skconfig.exceptions import ForbiddenValue
+from skconfig.exceptions import InactiveConditionedValue
+from skconfig.exceptions import InvalidParamChoices
+from skconfig.exceptions import InvalidParamName
+from skconfig.exceptions import InvalidParamRange
+from skconfig.exceptions import InvalidParamType
+from skconfig.exceptions import SKConfigValueError
+
+
+class DummyEstimator(BaseEstimator):
+    def __init__(self,
+                 penalty="l2",
+                 solver="lbfgs",
+                 C=1.0,
+                 max_iter=100,
+                 shuffle=True,
+                 l1_ratio=None,
+                 random_state=None):
+        self.penalty = penalty
+        self.solver = solver
+        self.C = C
+        self.max_iter = max_iter
+        self.shuffle = shuffle
+        self.l1_ratio = l1_ratio
+        self.random_state = random_state
+
+
+class DummyValidator(BaseValidator):
+    estimator = DummyEstimator
+
+    penalty = StringParam("l2", "l1", "elasticnet")
+    solver = StringParam("lbfgs", "liblinear", "saga")
+    C = FloatIntervalParam(lower=0, include_lower=False)
+    max_iter = IntIntervalParam(lower=1)
+    shuffle = BoolParam()
+    l1_ratio = FloatIntervalParam(lower=0, upper=1)
+    random_state = UnionParam(NoneParam(), IntIntervalParam(lower=0))
+
+    conditions = [EqualsCondition("l1_ratio", "penalty", "elasticnet")]
+    forbiddens = [
+        ForbiddenAnd([
+            ForbiddenEquals("penalty", "l1"),
+            ForbiddenIn("solver", ["lbfgs"])
+        ]),
+        ForbiddenAnd([
+            ForbiddenEquals("penalty", "elasticnet"),
+            ForbiddenIn("solver", ["lbfgs", "liblinear"])
+        ]),
+    ]
+
+
+@pytest.fixture
+def dummy_validator():
+    return DummyValidator()
+
+
+def test_validate_params_defaults(dummy_validator):
+    dummy_validator.validate_params()
+    dummy_validator.validate_params(C=2, max_iter=10, random_state=3)
+
+
+@pytest.mark.parametrize("params, error", [
+    ({"alpha": 1.0}, InvalidParamName),
+    ({"penalty": 1}, InvalidParamType),
+    ({"penalty": "l0"}, InvalidParamChoices),
+    ({"C": 0.0}, InvalidParamRange),
+    ({"max_iter": 1.5}, InvalidParamType),
+    ({"random_state": -1}, InvalidParamRange),
+    ({"random_state": "0"}, InvalidParamType),
+    ({"penalty": "l1"}, ForbiddenValue),
+    ({"l1_ratio": 0.5}, InactiveConditionedValue),
+    ({"penalty": "elasticnet", "solver": "saga"}, InvalidParamType),
+    ({"penalty": "elasticnet", "solver": "saga", "l1_ratio": 2.0},
+     InvalidParamRange),
+])
+def test_validate_params_invalid(dummy_validator, params, error):
+    with pytest.raises(error):
+        dummy_validator.validate_params(**params)
+
+
+def test_validate_params_conditioned_active(dummy_validator):
+    dummy_validator.validate_params(penalty="elasticnet", solver="saga", l1_ratio=0.5)
+
+
+def test_validate_estimator(dummy_validator):
+    dummy_validator.validate_estimator(DummyEstimator(penalty="l1", solver="saga"))
+    with pytest.raises(ForbiddenValue):
+        dummy_validator.validate_estimator(DummyEstimator(penalty="l1"))
+
+
+def test_parameters_inherited_from_parent_validator():
+    class ChildValidator(DummyValidator):
+        max_iter = IntIntervalParam(lower=10)
+
+    validator = ChildValidator()
+    assert set(validator.parameters_) == set(DummyValidator().parameters_)
+    validator.validate_params(penalty="elasticnet", solver="saga", l1_ratio=0.1)
+    with pytest.raises(InvalidParamRange):
+        validator.validate_params(max_iter=5)
+
+
+def test_plan_recompiled_on_class_attribute_change():
+    class ChildValidator(DummyValidator):
+        pass
+
+    validator = ChildValidator()
+    validator.validate_params(penalty="l1", solver="saga")
+    ChildValidator.forbiddens = [ForbiddenEquals("solver", "saga")]
+    with pytest.raises(ForbiddenValue):
+        validator.validate_params(penalty="l1", solver="saga")
+
+    ChildValidator.C = FloatIntervalParam(lower=10)
+    with pytest.raises(InvalidParamRange):
+        validator.validate_params(C=5.0)
+    del ChildValidator.C
+    validator.validate_params(C=5.0)
+
+
+def test_default_params_cached(monkeypatch):
+    from skconfig.defaults import get_default_params
+
+    class CountingEstimator(DummyEstimator):
+        n_init = 0
+
+        def __init__(self, C=1.0):
+            CountingEstimator.n_init += 1
+            super().__init__(C=C)
+
+    class CountingValidator(DummyValidator):
+        estimator = CountingEstimator
+
+    validator = CountingValidator()
+    for _ in range(3):
+        validator.validate_params(C=2.0)
+    validator.validate_estimator(CountingEstimator(C=3.0))
+    assert CountingEstimator.n_init == 2
+
+    defaults = get_default_params(CountingEstimator)
+    assert defaults == {"C": 1.0}
+    with pytest.raises(TypeError):
+        defaults["C"] = 2.0
+
+    # Replacing the constructor invalidates the cached defaults
+    def __init__(self, C=5.0):
+        DummyEstimator.__init__(self, C=C)
+
+    monkeypatch.setattr(CountingEstimator, "__init__", __init__)
+    assert get_default_params(CountingEstimator) == {"C": 5.0}
+
+
+def _is_valid(validator, params):
+    try:
+        validator.validate_params(**params)
+    except SKConfigValueError:
+        return False
+    return True
+
+
+VALUE_POOL = {
+    "penalty": ["l2", "l1", "elasticnet", "l0", 1, None],
+    "solver": ["lbfgs", "liblinear", "saga", 2.0],
+    "C": [1.0, 0.0, -1, 3, "1", True],
+    "max_iter": [1, 0, 10, 1.5],
+    "shuffle": [True, False, 1, None],
+    "l1_ratio": [None, 0.0, 0.5, 1, 2.0],
+    "random_state": [None, 0, 3, -1, "0"],
+    "alpha": [1.0],
+}
+
+
+def _random_records(n_records, seed=0):
+    rng = random.Random(seed)
+    records = []
+    for _ in range(n_records):
+        names = rng.sample(sorted(VALUE_POOL), rng.randint(0, 4))
+        records.append({name: rng.choice(VALUE_POOL[name]) for name in names})
+    return records
+
+
+def test_validate_many_records_matches_validate_params(dummy_validator):
+    records = _random_records(500)
+    result = dummy_validator.validate_many(records)
+    expected = [_is_valid(dummy_validator, record) for record in records]
+
+    assert result.mask.tolist() == expected
+    assert 0 < result.n_valid < len(records)
+    assert set(result.errors) == {
+        i for i, is_valid in enumerate(expected) if not is_valid
+    }
+    for i, error in result.errors.items():
+        with pytest.raises(error.error_cls):
+            dummy_validator.validate_params(**records[i])
+
+
+def test_validate_many_columns(dummy_validator):
+    columns = {
+        "penalty": np.array(["l2", "l1", "elasticnet", "elasticnet"]),
+        "solver": ["saga", "saga", "saga", "lbfgs"],
+        "C": np.array([1.0, 2.0, -1.0, 1.0]),
+        "max_iter": np.arange(1, 5),
+        "l1_ratio": [None, None, 0.5, 0.5],
+    }
+    result = dummy_validator.validate_many(columns)
+    assert result.mask.tolist() == [True, True, False, False]
+    assert result.errors[2].error_cls is InvalidParamRange
+    assert result.errors[3].error_cls is ForbiddenValue
+
+
+def test_validate_many_mixed_types_in_compared_column():
+    class Estimator(BaseEstimator):
+        def __init__(self, c=0.5, d=1.0):
+            self.c = c
+            self.d = d
+
+    class Validator(BaseValidator):
+        estimator = Estimator
+        c = FloatIntervalParam()
+        d = FloatIntervalParam()
+        conditions = [LessThanCondition("d", "c", 0.9)]
+
+    validator = Validator()
+    records = [{"c": "0.5", "d": 1.0}, {"c": 0.5, "d": 1.0}, {"c": 0.95}]
+    result = validator.validate_many(records)
+    assert result.mask.tolist() == [False, True, False]
+    assert result.errors[0].error_cls is InvalidParamType
+    assert result.errors[2].error_cls is InactiveConditionedValue
+
+    result = validator.validate_many({"c": np.array(["0.5", "1.0"])})
+    assert result.mask.tolist() == [False, False]
+    assert result.errors[0].error_cls is InvalidParamType
+
+
+def test_validate_many_dataframe(dummy_validator):
+    pd = pytest.importorskip("pandas")
+    frame = pd.DataFrame({
+        "penalty": ["l2", "l1", "elasticnet", "l1"],
+        "solver": ["lbfgs", "saga", "saga", "lbfgs"],
+        "max_iter": [10, 20, 30, 40],
+        "l1_ratio": pd.Series([None, None, 0.25, None], dtype=object),
+    })
+    result = dummy_validator.validate_many(frame)
+    assert result.mask.tolist() == [True, True, True, False]
+    assert result.errors[3].error_cls is ForbiddenValue
+
+
+def test_check_params(dummy_validator):
+    result = dummy_validator.check_params({"C": 2.0})
+    assert result and result.valid and result.errors == ()
+
+    result = dummy_validator.check_params({"penalty": "l1", "C": 0.0})
+    assert not result
+    assert len(result.errors) == 1
+    assert result.errors[0].error_cls is ForbiddenValue
+    with pytest.raises(ForbiddenValue):
+        result.raise_first()
+
+    result = dummy_validator.check_params(
+        {"alpha": 1, "penalty": "l1", "C": 0.0, "l1_ratio": 0.5},
+        collect_all=True)
+    assert [v.error_cls for v in result.errors] == [
+        InvalidParamName, ForbiddenValue, InvalidParamRange,
+        InactiveConditionedValue
+    ]
+    assert [v.name for v in result.errors] == [
+        "alpha", ("penalty", "solver"), "C", "l1_ratio"
+    ]
+
+
+def test_check_estimator(dummy_validator):
+    assert dummy_validator.check_estimator(DummyEstimator(C=3.0))
+    result = dummy_validator.check_estimator(DummyEstimator(C=-3.0))
+    assert result.errors[0].error_cls is InvalidParamRange
+
+
+@pytest.mark.parametrize("params, message", [
+    ({"alpha": 1}, "alpha is a invalid parameter name"),
+    ({"max_iter": 1.5}, "max_iter must be of type int"),
+    ({"C": 0}, r"C with value 0 not in range: \(0, inf\)"),
+    ({"penalty": "l0"}, "penalty must be one of"),
+    ({"penalty": "l1"},
+     "penalty and solver with value l1 and \\['lbfgs'\\] is forbidden"),
+    ({"l1_ratio": 0.5}, "l1_ratio has an unmet condition"),
+])
+def test_error_messages(dummy_validator, params, message):
+    violation = dummy_validator.check_params(params).errors[0]
+    assert re.match(message, violation.message)
+    with pytest.raises(violation.error_cls, match=message):
+        dummy_validator.validate_params(**params)
+
+
+def test_unknown_default_param_is_reported():
+    class PartialValidator(BaseValidator):
+        estimator = DummyEstimator
+        penalty = StringParam("l2", "l1")
+
+    result = PartialValidator().check_params({}, collect_all=True)
+    assert {v.name for v in result.errors} == {
+        "solver", "C", "max_iter", "shuffle", "l1_ratio", "random_state"
+    }
+    assert {v.error_cls for v in result.errors} == {InvalidParamName}
+
+
+def test_dependency_index(dummy_validator):
+    plan = DummyValidator._plan
+    forbiddens, conditions = plan.reachable({"solver": "saga"})
+    assert forbiddens == list(DummyValidator.forbiddens)
+    assert conditions == []
+
+    forbiddens, conditions = plan.reachable({"penalty": "l2"})
+    assert len(forbiddens) == 2
+    assert [cond for _, cond, _, _ in conditions] == DummyValidator.conditions
+
+    assert plan.reachable({"C": 1.0}) == ([], [])
+
+
+def test_validate_delta_matches_validate_params(dummy_validator):
+    rng = random.Random(0)
+    base = {"penalty": "elasticnet", "solver": "saga", "l1_ratio": 0.5}
+    dummy_validator.validate_params(**base)
+
+    n_invalid = 0
+    for _ in range(300):
+        name = rng.choice(sorted(VALUE_POOL))
+        changes = {name: rng.choice(VALUE_POOL[name])}
+        expected = _is_valid(dummy_validator, {**base, **changes})
+        assert bool(dummy_validator.check_delta(base, changes)) == expected
+        if expected:
+            dummy_validator.validate_delta(base, changes)
+            base = {**base, **changes}
+        else:
+            n_invalid += 1
+            with pytest.raises(SKConfigValueError):
+                dummy_validator.validate_delta(base, changes)
+    assert 0 < n_invalid < 300
+
+
+def test_iter_grid_matches_parameter_grid(dummy_validator):
+    choices = {
+        "penalty": ["l2", "l1", "elasticnet", "unknown"],
+        "solver": ["lbfgs", "liblinear", "saga"],
+        "l1_ratio": [None, 0.1, 0.5, 2],
+        "C": [0.1, 1.0, -1.0],
+        "shuffle": [True, False],
+    }
+    expected = [
+        params for params in ParameterGrid(choices)
+        if dummy_validator.check_params(params)
+    ]
+    result = list(dummy_validator.iter_grid(**choices))
+
+    def key(params):
+        return sorted(params.items(), key=str)
+
+    assert sorted(map(key, result), key=str) == sorted(
+        map(key, expected), key=str)
+    assert dummy_validator.count_grid(**choices) == len(expected)
+
+
+def test_iter_grid_prunes_forbidden_branches(dummy_validator, monkeypatch):
+    forbidden = DummyValidator.forbiddens[1]
+    calls = []
+    violation = forbidden.violation
+    monkeypatch.setattr(forbidden, "violation",
+                        lambda params: calls.append(1) or violation(params))
+    grid = dummy_validator.iter_grid(penalty=["elasticnet"],
+                                     solver=["lbfgs", "liblinear"],
+                                     l1_ratio=[0.1, 0.2, 0.3])
+    assert list(grid) == []
+    # Checked once per solver, the l1_ratio values are never expanded
+    assert len(calls) == 2
+
+
+def test_iter_grid_invalid_name(dummy_validator):
+    with pytest.raises(InvalidParamName):
+        dummy_validator.count_grid(unknown=[1, 2])
+
+
+def test_result_cache():
+    validator = DummyValidator(cache_size=2)
+    assert DummyValidator().cache_info() is None
+
+    validator.validate_params(penalty="l1", solver="saga")
+    validator.validate_params(solver="saga", penalty="l1")
+    for _ in range(2):
+        with pytest.raises(ForbiddenValue):
+            validator.validate_params(penalty="l1", solver="lbfgs")
+    assert validator.cache_info() == (2, 2, 2, 2)
+
+    # Keys include the type of the values
+    with pytest.raises(InvalidParamType):
+        validator.validate_params(max_iter=1.0)
+    validator.validate_params(max_iter=1)
+    assert validator.cache_info().misses == 4
+    assert validator.cache_info().currsize == 2
+
+    # Unhashable values bypass the cache
+    with pytest.raises(InvalidParamType):
+        validator.validate_params(random_state=[1])
+    assert validator.cache_info().misses == 4
+
+
+def test_result_cache_size_on_class():
+    class CachedValidator(DummyValidator):
+        cache_size = 128
+
+    validator = CachedValidator()
+    assert validator.cache_size == 128
+    assert validator.cache_info().maxsize == 128
+    assert CachedValidator(cache_size=4).cache_info().maxsize == 4
+
+
+def test_result_cache_dropped_when_plan_changes():
+    class ChildValidator(DummyValidator):
+        pass
+
+    validator = ChildValidator(cache_size=10)
+    validator.validate_params(penalty="l1", solver="saga")
+    ChildValidator.forbiddens = [ForbiddenEquals("solver", "saga")]
+    assert not validator.check_params({"penalty": "l1", "solver": "saga"})
+    assert validator.cache_info().currsize == 1
+
+
+def test_validator_with_abstract_base():
+    class Checked(ABC):
+        @abstractmethod
+        def describe(self):
+            pass
+
+    class AbstractValidator(DummyValidator, Checked):
+        pass
+
+    with pytest.raises(TypeError):
+        AbstractValidator()
+
+    class ConcreteValidator(AbstractValidator):
+        def describe(self):
+            return "dummy"
+
+    validator = ConcreteValidator()
+    assert isinstance(validator, Checked)
+    with pytest.raises(ForbiddenValue):
+        validator.validate_params(penalty="l1")
+
+
+def test_instance_level_clauses():
+    class InstanceValidator(DummyValidator):
+        def __init__(self, forbiddens):
+            self.forbiddens = forbiddens
+            super().__init__()
+
+    validator = InstanceValidator([ForbiddenEquals("solver", "saga")])
+    with pytest.raises(ForbiddenValue):
+        validator.validate_params(solver="saga")
+    # The class plan is left alone
+    DummyValidator().validate_params(solver="saga")
+
+    validator.conditions = []
+    validator.validate_params(solver="liblinear", l1_ratio=0.5)
+    assert not validator.check_params({"solver": "saga"})